@@ -19,6 +19,21 @@ import logging
 import os
 
 UAC_ACCOUNT_DISABLED = 0x0002
+# Rows exposed to the view per fetchMore() call for large containers
+FETCH_BATCH_SIZE = 200
+# Object kinds used to pick context and action pane menus, in priority
+# order. Computers are also users, so they must be checked first.
+OBJECT_KINDS = ('computer', 'user', 'group', 'contact')
+
+def classify_object(obj_classes):
+    """
+    Returns the menu kind for an object from its objectClass values, or None
+    if it is not one of OBJECT_KINDS.
+    """
+    for kind in OBJECT_KINDS:
+        if kind in obj_classes:
+            return kind
+    return None
 
 class ADListModel(QAbstractTableModel):
     """
@@ -31,6 +46,18 @@ class ADListModel(QAbstractTableModel):
         self.logger = logging.getLogger("saduc_app." + self.__class__.__name__)
         self.i18n = I18nManager()
         self._data = []
+        # Display values are stored per column, in the same row order as
+        # _data, so data() is a plain list lookup during painting.
+        self._name_col = []
+        self._type_col = []
+        self._desc_col = []
+        self._columns = (self._name_col, self._type_col, self._desc_col)
+        # objectClass values of each row as a frozenset, for kind checks
+        self._class_col = []
+        # Every per-row list, kept in step when sorting or inserting
+        self._row_cols = self._columns + (self._class_col,)
+        # Number of rows in _data currently exposed to the view
+        self._loaded = 0
         # Use a fixed set of headers, similar to the default ADUC view.
         self._headers = [
             self.i18n.get_string("table.header.name"),
@@ -61,10 +88,29 @@ class ADListModel(QAbstractTableModel):
             if os.path.exists(icon_path):
                 self.icon_cache[name] = QIcon(icon_path)
             else:
-                self.logger.warning(f"Icon not found for {name} at {icon_path}")
+                self.logger.warning("Icon not found for %s at %s", name, icon_path)
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self._data)
+        return self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._data)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """
+        Exposes the next batch of rows. The view calls this as the user
+        scrolls towards the end of the loaded rows.
+        """
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH_SIZE, len(self._data) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
 
     def columnCount(self, parent=QModelIndex()):
         return len(self._headers)
@@ -102,23 +148,17 @@ class ADListModel(QAbstractTableModel):
 
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid() or not (0 <= index.row() < self.rowCount()):
+        if not index.isValid() or not (0 <= index.row() < self._loaded):
             return QVariant()
 
-        item = self._data[index.row()]
+        row = index.row()
         column = index.column()
 
         if role == Qt.DisplayRole:
-            if column == 0:  # Name column
-                return item.get('name', '')
-            elif column == 1:  # Type column
-                return self._get_object_type(item)
-            elif column == 2:  # Description column
-                return item.get('description', '')
+            return self._columns[column][row]
         elif role == Qt.DecorationRole:
             if column == 0:
-                obj_type = self._get_object_type(item)
-                return self.icon_cache.get(obj_type, self.icon_cache.get("Unknown"))
+                return self.icon_cache.get(self._type_col[row], self.icon_cache.get("Unknown"))
 
         return QVariant()
 
@@ -130,34 +170,61 @@ class ADListModel(QAbstractTableModel):
 
     def sort(self, column, order):
         """Sorts the table by a given column."""
-        self.beginResetModel()
-        
-        reverse = (order == Qt.DescendingOrder)
-        
-        # Define a key function based on the column index
-        if column == 0: # Name
-            key_func = lambda item: item.get('name', '').lower()
-        elif column == 1: # Type
-            key_func = lambda item: self._get_object_type(item).lower()
-        elif column == 2: # Description
-            key_func = lambda item: item.get('description', '').lower()
-        else:
-            # If column is invalid, just end the reset
-            self.endResetModel()
+        if not 0 <= column < len(self._columns):
+            # No sort column (e.g. a cleared sort indicator); nothing to do
             return
-
-        self._data.sort(key=key_func, reverse=reverse)
-        
-        self.endResetModel()
+        reverse = (order == Qt.DescendingOrder)
+        keys = [value.lower() for value in self._columns[column]]
+        new_order = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+        # Sorting keeps the row count, so a layout change (which preserves
+        # the view's selection and current index) is enough.
+        self.layoutAboutToBeChanged.emit()
+
+        self._data[:] = [self._data[i] for i in new_order]
+        for col in self._row_cols:
+            col[:] = [col[i] for i in new_order]
+
+        new_rows = [0] * len(new_order)
+        for new_row, old_row in enumerate(new_order):
+            new_rows[old_row] = new_row
+        old_indexes = self.persistentIndexList()
+        new_indexes = []
+        for index in old_indexes:
+            row = new_rows[index.row()]
+            new_indexes.append(self.index(row, index.column()) if row < self._loaded else QModelIndex())
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
 
     def setData(self, data):
         """
-        Resets the model with new data from the backend.
+        Resets the model with new data from the backend. Only the first
+        batch of rows is exposed; the rest is added through fetchMore().
         """
         self.beginResetModel()
         self._data = data if data is not None else []
+        self._name_col[:] = [item.get('name', '') for item in self._data]
+        self._type_col[:] = [self._get_object_type(item) for item in self._data]
+        self._desc_col[:] = [item.get('description', '') for item in self._data]
+        self._class_col[:] = [frozenset(item.get('objectClass', ())) for item in self._data]
+        self._loaded = min(len(self._data), FETCH_BATCH_SIZE)
         self.endResetModel()
-        self.logger.debug(f"Model updated with {len(self._data)} items.")
+        self.logger.debug("Model updated with %d items.", len(self._data))
+
+    def add_object(self, obj):
+        """
+        Adds a single object (e.g. one just created) after the loaded rows,
+        without reloading the whole container.
+        """
+        row = self._loaded
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._data.insert(row, obj)
+        self._name_col.insert(row, obj.get('name', ''))
+        self._type_col.insert(row, self._get_object_type(obj))
+        self._desc_col.insert(row, obj.get('description', ''))
+        self._class_col.insert(row, frozenset(obj.get('objectClass', ())))
+        self._loaded += 1
+        self.endInsertRows()
 
     def clear_data(self):
         """
@@ -169,6 +236,15 @@ class ADListModel(QAbstractTableModel):
         """
         Returns the entire data dictionary for the object at a given index.
         """
-        if index.isValid() and 0 <= index.row() < len(self._data):
+        if index.isValid() and 0 <= index.row() < self._loaded:
             return self._data[index.row()]
         return None
+
+    def get_object_classes(self, index):
+        """
+        Returns the objectClass values of the object at a given index as a
+        frozenset, or an empty frozenset for an invalid index.
+        """
+        if index.isValid() and 0 <= index.row() < self._loaded:
+            return self._class_col[index.row()]
+        return frozenset()
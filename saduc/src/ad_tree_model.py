@@ -18,6 +18,9 @@ from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt
 from PyQt5.QtGui import QIcon
 from samba_backend import get_forest_root_info, get_expandable_children, has_expandable_children
 
+# Custom item data role exposing an item's distinguished name to views
+DN_ROLE = Qt.UserRole + 1
+
 # --- ADTreeItem Class ---
 class ADTreeItem:
     """A node in the AD tree, representing an LDAP object."""
@@ -26,6 +29,14 @@ class ADTreeItem:
         self._data = data
         self._dn = dn
         self._object_class = object_class
+        # The object's classes as a set, whether a list or a single class
+        # name was given, for quick membership tests
+        if isinstance(object_class, list):
+            self.object_classes = frozenset(object_class)
+        elif object_class is not None:
+            self.object_classes = frozenset((object_class,))
+        else:
+            self.object_classes = frozenset()
         self._children = []
         self._children_fetched = False
         # This flag determines if the item can have container children.
@@ -113,7 +124,7 @@ class ADTreeModel(QAbstractItemModel):
         self.logger.info("ADTreeModel: Model initialized.")
 
     def set_advanced_view(self, enabled):
-        self.logger.info(f"Setting advanced view to: {enabled}")
+        self.logger.info("Setting advanced view to: %s", enabled)
         self.advanced_view = enabled
         self.beginResetModel()
         self.root_item = ADTreeItem(None, dn=None)
@@ -126,7 +137,7 @@ class ADTreeModel(QAbstractItemModel):
             if os.path.exists(icon_path):
                 self.icon_cache[name] = QIcon(icon_path)
             else:
-                self.logger.warning(f"Icon not found for {name} at {icon_path}")
+                self.logger.warning("Icon not found for %s at %s", name, icon_path)
 
     def _get_icon_for_item(self, item):
         object_class = item.object_class()
@@ -182,6 +193,8 @@ class ADTreeModel(QAbstractItemModel):
             return item.data()
         elif role == Qt.DecorationRole:
             return self._get_icon_for_item(item)
+        elif role == DN_ROLE:
+            return item.dn()
         
         return None
 
@@ -267,7 +280,7 @@ class ADTreeModel(QAbstractItemModel):
             return
 
         parent_dn = parent_item.dn()
-        self.logger.debug(f"ADTreeModel: Fetching children for '{parent_dn}'.")
+        self.logger.debug("ADTreeModel: Fetching children for '%s'.", parent_dn)
         
         child_data_list = get_expandable_children(self.samba_conn, parent_dn, self.advanced_view)
 
@@ -281,5 +294,5 @@ class ADTreeModel(QAbstractItemModel):
             self.endInsertRows()
         
         parent_item.set_children_fetched(True)
-        self.logger.debug(f"ADTreeModel: Fetched and added {len(child_data_list)} children for '{parent_dn}'.")
+        self.logger.debug("ADTreeModel: Fetched and added %d children for '%s'.", len(child_data_list), parent_dn)
 
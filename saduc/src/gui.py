@@ -21,17 +21,83 @@ from PyQt5.QtWidgets import (
     QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QMenu, QScrollArea, QFrame,
     QAction, QMessageBox
 )
-from PyQt5.QtCore import Qt, QSize, QTimer, QModelIndex
+from PyQt5.QtCore import (
+    Qt, QSize, QTimer, QModelIndex, QObject, QRunnable, QThreadPool, pyqtSignal
+)
 
 from i18n_manager import I18nManager
 from samba_backend import get_all_objects_in_dn
-from ad_tree_model import ADTreeModel
-from ad_list_model import ADListModel
+from ad_tree_model import ADTreeModel, DN_ROLE
+from ad_list_model import ADListModel, classify_object, OBJECT_KINDS
 
 from tree_menu_manager import TreeMenuManager
 from list_menu_manager import ListMenuManager
 import main_window_actions as actions
 
+# Delay used to coalesce bursts of tree clicks into a single container load
+TREE_CLICK_DEBOUNCE_MS = 150
+
+
+# Action pane menus for selected objects, with one entry for every kind
+# classify_object() can return. A kind mapped to None gets no action section.
+# A slot of None shows the entry disabled.
+OBJECT_ACTION_MENUS = {
+    'user': {
+        "action_pane.menu.copy_user": actions.on_copy_user_action_triggered,
+        "action_pane.menu.delete_user": actions.on_delete_user_action_triggered,
+        "action_pane.menu.disable_user": actions.on_disable_user_action_triggered
+    },
+    'computer': {
+        "action_pane.menu.disable_computer": None,
+        "action_pane.menu.reset_computer_account": None
+    },
+    'group': {
+        "action_pane.menu.delete_group": None
+    },
+    'contact': None
+}
+
+# Action pane menus, keyed by the kind of the selected container or object.
+# The object kinds come from OBJECT_KINDS, so a kind added there without a
+# matching OBJECT_ACTION_MENUS entry fails at import rather than silently.
+ACTION_PANE_MENUS = {
+    'container': {
+        "action_pane.menu.new_user": actions.on_new_user_action_triggered,
+        "action_pane.menu.new_group": actions.on_new_group_action_triggered,
+        "action_pane.menu.new_computer": actions.on_new_computer_action_triggered
+    },
+    **{kind: OBJECT_ACTION_MENUS[kind] for kind in OBJECT_KINDS}
+}
+
+
+# --- Container Fetch Worker ---
+class _FetchSignals(QObject):
+    """Signals emitted by _FetchRunnable; delivered on the GUI thread."""
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class _FetchRunnable(QRunnable):
+    """
+    Fetches the objects of a container on a QThreadPool worker so the LDAP
+    round-trip does not block the GUI thread. The request id lets the main
+    window discard results for a container that is no longer selected.
+    """
+    def __init__(self, request_id, samba_conn, dn):
+        super().__init__()
+        self.request_id = request_id
+        self.samba_conn = samba_conn
+        self.dn = dn
+        self.signals = _FetchSignals()
+
+    def run(self):
+        try:
+            list_data = get_all_objects_in_dn(self.samba_conn, self.dn)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+            return
+        self.signals.finished.emit(self.request_id, list_data)
+
 
 # --- SADUCMainWindow Class ---
 class SADUCMainWindow(QMainWindow):
@@ -53,6 +119,7 @@ class SADUCMainWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
 
         self.advancedFeaturesAction = None
+        self._splitters_sized = False
         self.tree_menu_manager = TreeMenuManager(self)
         self.list_menu_manager = ListMenuManager(self)
 
@@ -71,6 +138,19 @@ class SADUCMainWindow(QMainWindow):
 
         self.currentContainerDN = None
         self.current_selected_dn = None
+        self.current_selected_name = None
+
+        self._pending_dn = None
+        self._pending_name = None
+        self._click_timer = QTimer(self)
+        self._click_timer.setSingleShot(True)
+        self._click_timer.timeout.connect(self._do_load_container)
+        self._fetch_request_id = 0
+        self._active_fetch = None
+        self._loading_name = None
+        self._loading_dn = None
+        # DN of the container whose objects the list currently shows
+        self._listed_dn = None
 
         self.setUnifiedTitleAndToolBarOnMac(True)
         self.logger.debug("SADUCMainWindow: Main window initialized.")
@@ -133,6 +213,7 @@ class SADUCMainWindow(QMainWindow):
         self.treePane.setObjectName("TreePane")
         self.treePane.setMinimumSize(150, 100)
         self.treePane.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.treePane.setUniformRowHeights(True)
         self.treePane.setContextMenuPolicy(Qt.CustomContextMenu)
         self.treePane.customContextMenuRequested.connect(self.tree_menu_manager.on_tree_context_menu)
 
@@ -143,9 +224,9 @@ class SADUCMainWindow(QMainWindow):
         self.listPane.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.listPane.setShowGrid(False)
         self.listPane.verticalHeader().hide()
-        self.listPane.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.listPane.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.listPane.verticalHeader().setDefaultSectionSize(self.listPane.fontMetrics().height() + 4)
         self.listPane.setWordWrap(False)
-        self.listPane.setSortingEnabled(True)
         self.listPane.setContextMenuPolicy(Qt.CustomContextMenu)
         self.listPane.customContextMenuRequested.connect(self.list_menu_manager.on_list_context_menu)
         self.listPane.doubleClicked.connect(partial(actions.on_list_item_double_clicked, self))
@@ -156,8 +237,7 @@ class SADUCMainWindow(QMainWindow):
         self.actionPane.setMinimumSize(100, 100)
         self.actionPane.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-        self.actionPaneLayout = QVBoxLayout()
-        self.actionPane.setLayout(self.actionPaneLayout)
+        self.actionPaneLayout = QVBoxLayout(self.actionPane)
         actionPaneStaticTitle = QLabel(self.i18n.get_string("action_pane.static_title"))
         actionPaneStaticTitle.setStyleSheet("font-weight: bold; font-size: 14pt; padding: 5px;")
         self.actionPaneLayout.addWidget(actionPaneStaticTitle)
@@ -166,75 +246,98 @@ class SADUCMainWindow(QMainWindow):
         scrollArea.setWidgetResizable(True)
         scrollArea.setFrameShape(QFrame.NoFrame)
         scrollArea.setStyleSheet("QScrollArea { border: none; }")
-        self.actionContentWidget = QWidget()
-        self.actionContentLayout = QVBoxLayout(self.actionContentWidget)
+        # The frame is the scroll content itself and directly holds the list
+        # and item action sections.
+        self.actionContentFrame = QFrame()
+        self.actionContentFrame.setFrameShape(QFrame.NoFrame)
+        self.actionContentLayout = QVBoxLayout(self.actionContentFrame)
         self.actionContentLayout.setContentsMargins(0, 0, 0, 0)
         self.actionContentLayout.setSpacing(0)
-        scrollArea.setWidget(self.actionContentWidget)
+        # The two sections are created once and re-titled per click
+        self._action_menus = {}
+        self.listActionSection = self._create_action_section()
+        self.itemActionSection = self._create_action_section()
+        self.actionContentLayout.addWidget(self.listActionSection)
+        self.actionContentLayout.addWidget(self.itemActionSection)
+        self.actionContentLayout.addStretch(1)
+        scrollArea.setWidget(self.actionContentFrame)
         self.actionPaneLayout.addWidget(scrollArea)
 
-        self.listActionLayout = QVBoxLayout()
-        self.itemActionLayout = QVBoxLayout()
-        self.actionContentLayout.addLayout(self.listActionLayout)
-        self.actionContentLayout.addLayout(self.itemActionLayout)
-        self.actionContentLayout.addStretch(1)
+        self.mainSplitter = QSplitter(Qt.Horizontal)
+        self.mainSplitter.addWidget(self.treePane)
+        self.rightSideSplitter = QSplitter(Qt.Horizontal)
+        self.rightSideSplitter.addWidget(self.listPane)
+        self.rightSideSplitter.addWidget(self.actionPane)
+        self.mainSplitter.addWidget(self.rightSideSplitter)
+        self.setCentralWidget(self.mainSplitter)
 
-        mainSplitter = QSplitter(Qt.Horizontal)
-        mainSplitter.addWidget(self.treePane)
-        rightSideSplitter = QSplitter(Qt.Horizontal)
-        rightSideSplitter.addWidget(self.listPane)
-        rightSideSplitter.addWidget(self.actionPane)
-        mainSplitter.addWidget(rightSideSplitter)
-        self.setCentralWidget(mainSplitter)
-
-        def set_initial_sizes():
-            total_width = mainSplitter.width()
-            left_pane_width = int(total_width * 0.20)
-            middle_pane_width = int(total_width * 0.65)
-            right_pane_width = total_width - left_pane_width - middle_pane_width
-            mainSplitter.setSizes([left_pane_width, middle_pane_width + right_pane_width])
-            rightSideSplitter.setSizes([middle_pane_width, right_pane_width])
-            self.logger.info(f"Initial splitter sizes set to: {mainSplitter.sizes()}, {rightSideSplitter.sizes()}")
-
-        QTimer.singleShot(0, set_initial_sizes)
         self.logger.debug("SADUCMainWindow: Central widget layout created.")
 
-    def _clear_layout(self, layout):
+    def showEvent(self, event):
         """
-        Helper method to clear all items from a layout.
+        Sets the initial splitter sizes the first time the window is shown,
+        once the splitters have their real width.
         """
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-            elif item.layout():
-                self._clear_layout(item.layout())
+        super().showEvent(event)
+        if not self._splitters_sized:
+            self._set_splitter_sizes()
+            self._splitters_sized = True
 
-    def _create_action_section(self, title, action_map=None):
+    def _set_splitter_sizes(self):
+        """
+        Splits the window 20/65/15 between the tree, list and action panes.
         """
-        Helper to create a dynamic action section with a title and a menu button.
+        total_width = self.mainSplitter.width()
+        left_pane_width = int(total_width * 0.20)
+        middle_pane_width = int(total_width * 0.65)
+        right_pane_width = total_width - left_pane_width - middle_pane_width
+        self.mainSplitter.setSizes([left_pane_width, middle_pane_width + right_pane_width])
+        self.rightSideSplitter.setSizes([middle_pane_width, right_pane_width])
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Initial splitter sizes set to: %s, %s", self.mainSplitter.sizes(), self.rightSideSplitter.sizes())
+
+    def _create_action_section(self):
         """
-        sectionLayout = QHBoxLayout()
-        titleLabel = QLabel(title)
-        titleLabel.setStyleSheet("font-weight: bold;")
-        sectionLayout.addWidget(titleLabel)
+        Helper to create a reusable action section with a title and a menu
+        button. The section starts hidden; see _show_action_section.
+        """
+        section = QWidget()
+        sectionLayout = QHBoxLayout(section)
+        sectionLayout.setContentsMargins(0, 0, 0, 0)
+        section._title = QLabel()
+        section._title.setStyleSheet("font-weight: bold;")
+        sectionLayout.addWidget(section._title)
         sectionLayout.addStretch(1)
 
-        actionButton = QPushButton(self.i18n.get_string("action_pane.button.actions"))
-        actionMenu = QMenu()
-        if action_map:
-            for action_text_key, slot_method in action_map.items():
-                action_text = self.i18n.get_string(action_text_key)
-                action = QAction(action_text, self)
+        section._button = QPushButton(self.i18n.get_string("action_pane.button.actions"))
+        sectionLayout.addWidget(section._button)
+        section.hide()
+        return section
+
+    def _show_action_section(self, section, title, kind):
+        """
+        Shows an action section with the given title and the cached menu for
+        the given kind of container or object.
+        """
+        section._title.setText(title)
+        section._button.setMenu(self._get_action_menu(kind))
+        section.show()
+
+    def _get_action_menu(self, kind):
+        """
+        Returns the action pane menu for a kind, building it on first use.
+        """
+        actionMenu = self._action_menus.get(kind)
+        if actionMenu is None:
+            actionMenu = QMenu(self)
+            for action_text_key, slot_method in ACTION_PANE_MENUS[kind].items():
+                action = actionMenu.addAction(self.i18n.get_string(action_text_key))
                 if slot_method:
                     action.triggered.connect(partial(slot_method, self))
                 else:
                     action.setEnabled(False)
-                actionMenu.addAction(action)
-        actionButton.setMenu(actionMenu)
-        sectionLayout.addWidget(actionButton)
-        return sectionLayout
+            self._action_menus[kind] = actionMenu
+        return actionMenu
 
     def _setup_tree_view_model(self):
         """
@@ -246,12 +349,15 @@ class SADUCMainWindow(QMainWindow):
         self.treePane.setModel(self.adModel)
         self.logger.debug("SADUCMainWindow: Tree view model set.")
 
+        # Expand the server root and its immediate children in a single pass
+        # (requires Qt 5.13+), then collapse everything but the domain again so
+        # only the root and the domain start out expanded, as before.
         saduc_root_index = self.adModel.index(0, 0, QModelIndex())
         if saduc_root_index.isValid():
-            self.treePane.expand(saduc_root_index)
-            domain_index = self.adModel.index(1, 0, saduc_root_index)
-            if domain_index.isValid():
-                self.treePane.expand(domain_index)
+            self.treePane.expandRecursively(saduc_root_index, 1)
+            for row in range(self.adModel.rowCount(saduc_root_index)):
+                if row != 1:
+                    self.treePane.collapse(self.adModel.index(row, 0, saduc_root_index))
 
     def _setup_table_view_model(self):
         """
@@ -260,6 +366,9 @@ class SADUCMainWindow(QMainWindow):
         self.logger.debug("SADUCMainWindow: Setting up table view model.")
         self.tableModel = ADListModel()
         self.listPane.setModel(self.tableModel)
+        # Start unsorted so enabling sorting doesn't sort the (empty) model
+        self.listPane.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.listPane.setSortingEnabled(True)
         self.logger.debug("SADUCMainWindow: Table view model set.")
 
     def _on_tree_item_clicked(self, index):
@@ -271,59 +380,130 @@ class SADUCMainWindow(QMainWindow):
             return
 
         tree_item = index.internalPointer()
-        obj_classes = tree_item.object_class() if isinstance(tree_item.object_class(), list) else [tree_item.object_class()]
+        obj_classes = tree_item.object_classes
 
         if 'saducRoot' in obj_classes:
+            self._click_timer.stop()
+            self._fetch_request_id += 1
+            self._listed_dn = None
             self.tableModel.clear_data()
-            self._clear_layout(self.listActionLayout)
-            self._clear_layout(self.itemActionLayout)
+            self.listActionSection.hide()
+            self.itemActionSection.hide()
             self.statusBar().showMessage(self.i18n.get_string("main.status_bar_ready"))
             return
 
         if 'savedQueriesRoot' in obj_classes:
             self.logger.info("Saved Queries item clicked. This is a local-only feature.")
+            self._click_timer.stop()
+            self._fetch_request_id += 1
+            self._listed_dn = None
             self.tableModel.clear_data()
-            self._clear_layout(self.listActionLayout)
-            self._clear_layout(self.itemActionLayout)
+            self.listActionSection.hide()
+            self.itemActionSection.hide()
             self.statusBar().showMessage("Saved Queries (Not Implemented)")
             return
 
-        self.currentContainerDN = tree_item.dn()
-        container_name = tree_item.data()
-        self.logger.info(f"Tree item clicked: '{container_name}' (DN: {self.currentContainerDN})")
+        self._pending_dn = index.data(DN_ROLE)
+        self._pending_name = index.data(Qt.DisplayRole)
+        self._click_timer.start(TREE_CLICK_DEBOUNCE_MS)
+
+    def _do_load_container(self):
+        """
+        Starts loading the container from the most recent tree click. Driven
+        by the debounce timer so that rapid navigation only queries the final
+        selection; the LDAP search itself runs on the global thread pool.
+        """
+        self.currentContainerDN = self._pending_dn
+        container_name = self._pending_name
+        self.logger.info("Tree item clicked: '%s' (DN: %s)", container_name, self.currentContainerDN)
 
+        self._listed_dn = None
         self.tableModel.clear_data()
-        self._clear_layout(self.listActionLayout)
-        self._clear_layout(self.itemActionLayout)
+        self.listActionSection.hide()
+        self.itemActionSection.hide()
         self.statusBar().showMessage(self.i18n.get_text("status.loading", container_name))
 
-        try:
-            list_data = get_all_objects_in_dn(self.samba_conn, self.currentContainerDN)
-            self.tableModel.setData(list_data)
-            self.statusBar().showMessage(self.i18n.get_text("status.loaded_items", len(list_data), container_name))
-        except Exception as e:
-            self.logger.error(f"Failed to fetch objects for DN '{self.currentContainerDN}': {e}")
-            QMessageBox.critical(self, self.i18n.get_string("dialog.common.error.title"),
-                                 self.i18n.get_text("error.backend.fetch_failed", str(e)))
-            self.statusBar().showMessage(self.i18n.get_string("main.status_bar_ready"))
+        self._fetch_request_id += 1
+        self._loading_name = container_name
+        self._loading_dn = self.currentContainerDN
+        runnable = _FetchRunnable(self._fetch_request_id, self.samba_conn, self.currentContainerDN)
+        runnable.signals.finished.connect(self._on_container_loaded)
+        runnable.signals.failed.connect(self._on_container_load_failed)
+        # Keep the runnable (and its signals object) alive until it reports back
+        self._active_fetch = runnable
+        QThreadPool.globalInstance().start(runnable)
+
+    def _on_container_loaded(self, request_id, list_data):
+        """
+        Slot receiving the worker's results. Populates the table and action
+        pane unless a newer request has superseded this one.
+        """
+        if request_id != self._fetch_request_id:
+            self.logger.debug("Discarding stale container results (request %d).", request_id)
             return
+        self._active_fetch = None
+        container_name = self._loading_name
+        self._listed_dn = self._loading_dn
+
+        self._populate_table(list_data)
+        self.statusBar().showMessage(self.i18n.get_text("status.loaded_items", len(list_data), container_name))
 
-        action_map = {
-            "action_pane.menu.new_user": actions.on_new_user_action_triggered,
-            "action_pane.menu.new_group": actions.on_new_group_action_triggered,
-            "action_pane.menu.new_computer": actions.on_new_computer_action_triggered
-        }
-        self.listActionLayout.addLayout(self._create_action_section(container_name, action_map))
+        self._show_action_section(self.listActionSection, container_name, 'container')
 
         header = self.listPane.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Interactive)
         header.setSectionResizeMode(1, QHeaderView.Interactive)
         header.setSectionResizeMode(2, QHeaderView.Stretch)
-        self.listPane.resizeColumnsToContents()
-        header.setSectionResizeMode(2, QHeaderView.Stretch)
         self.listPane.setColumnWidth(0, int(self.listPane.width() * 0.3))
         self.listPane.setColumnWidth(1, int(self.listPane.width() * 0.2))
 
+    def _on_container_load_failed(self, request_id, error):
+        """
+        Slot receiving a worker failure for the current request.
+        """
+        if request_id != self._fetch_request_id:
+            return
+        self._active_fetch = None
+        self.logger.error("Failed to fetch objects for DN '%s': %s", self.currentContainerDN, error)
+        QMessageBox.critical(self, self.i18n.get_string("dialog.common.error.title"),
+                             self.i18n.get_text("error.backend.fetch_failed", error))
+        self.statusBar().showMessage(self.i18n.get_string("main.status_bar_ready"))
+
+    def _populate_table(self, list_data):
+        """
+        Loads new rows into the table model with view updates suspended, so
+        the reset is painted once rather than as the rows arrive. Sorting is
+        off while the data is set; re-enabling it applies the sort the user
+        picked, if any, once to the new rows. Without one they stay in
+        server order.
+        """
+        self.listPane.setUpdatesEnabled(False)
+        self.listPane.setSortingEnabled(False)
+        try:
+            self.tableModel.setData(list_data)
+        finally:
+            self.listPane.setSortingEnabled(True)
+            self.listPane.setUpdatesEnabled(True)
+            self.listPane.viewport().update()
+
+    def add_listed_object(self, obj, container_dn):
+        """
+        Adds a newly created object to the list if it belongs to the container
+        the list is showing, keeping the current sort. If the list shows some
+        other container, or a load is still pending, the tree's current
+        selection is reloaded instead.
+        """
+        load_pending = self._active_fetch is not None or self._click_timer.isActive()
+        if (load_pending or not container_dn or not self._listed_dn
+                or container_dn.lower() != self._listed_dn.lower()):
+            self._on_tree_item_clicked(self.treePane.currentIndex())
+            return
+
+        self.tableModel.add_object(obj)
+        header = self.listPane.horizontalHeader()
+        if header.sortIndicatorSection() >= 0:
+            self.tableModel.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+
     def _on_table_item_clicked(self, index):
         """
         Slot to handle clicks on the table view.
@@ -339,28 +519,12 @@ class SADUCMainWindow(QMainWindow):
 
         name = selected_object_data.get('name', 'Unknown')
         self.current_selected_dn = selected_object_data.get('dn')
-        obj_classes = selected_object_data.get('objectClass', [])
-        self.logger.info(f"Table item clicked: '{name}' (DN: {self.current_selected_dn})")
+        self.current_selected_name = name
+        self.logger.info("Table item clicked: '%s' (DN: %s)", name, self.current_selected_dn)
         self.statusBar().showMessage(self.i18n.get_text("status.selected_item", name))
 
-        self._clear_layout(self.itemActionLayout)
-
-        action_map = {}
-        if 'user' in obj_classes and 'computer' not in obj_classes:
-            action_map = {
-                "action_pane.menu.copy_user": actions.on_copy_user_action_triggered,
-                "action_pane.menu.delete_user": actions.on_delete_user_action_triggered,
-                "action_pane.menu.disable_user": actions.on_disable_user_action_triggered
-            }
-        elif 'computer' in obj_classes:
-            action_map = {
-                "action_pane.menu.disable_computer": None,
-                "action_pane.menu.reset_computer_account": None
-            }
-        elif 'group' in obj_classes:
-            action_map = {
-                "action_pane.menu.delete_group": None
-            }
-        
-        if action_map:
-            self.itemActionLayout.addLayout(self._create_action_section(name, action_map))
\ No newline at end of file
+        self.itemActionSection.hide()
+
+        kind = classify_object(self.tableModel.get_object_classes(index))
+        if ACTION_PANE_MENUS.get(kind):
+            self._show_action_section(self.itemActionSection, name, kind)
@@ -1,18 +1,41 @@
 # src/i18n_manager.py
 
 import os
+import re
 import logging
 
+# Matches 'key = value' entries; comment and blank lines never match.
+_LINE_RE = re.compile(r'(?m)^[ \t]*([^#\s=][^=\n]*?)[ \t]*=(.*)$')
+# Matches non-comment lines that are missing the '=' separator.
+_INVALID_LINE_RE = re.compile(r'(?m)^[ \t]*([^#\s=][^=\n]*?)[ \t]*$')
+
 class I18nManager:
     """
     Manages loading and retrieving internationalized strings from text files.
+    One shared instance exists per language, so each file is parsed once.
     """
+    _instances = {}
+
+    def __new__(cls, lang_code='en_US', base_path='i18n'):
+        key = (lang_code, base_path)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance._initialized = False
+            cls._instances[key] = instance
+        return instance
+
     def __init__(self, lang_code='en_US', base_path='i18n'):
+        if self._initialized:
+            return
         self.logger = logging.getLogger("saduc_app." + self.__class__.__name__)
         self.lang_code = lang_code
         self.base_path = base_path
         self._strings = {}
+        # Keys whose values contain str.format placeholders
+        self._format_keys = set()
         self.load_strings()
+        self._initialized = True
 
     def load_strings(self):
         """
@@ -26,17 +49,13 @@ class I18nManager:
             return
 
         with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                try:
-                    key, value = line.split('=', 1)
-                    self._strings[key.strip()] = value.strip()
-                except ValueError:
-                    self.logger.warning(f"Invalid string format in {self.lang_code}.txt: '{line}'")
+            data = f.read()
+
+        self._strings = {key: value.strip() for key, value in _LINE_RE.findall(data)}
+        for line in _INVALID_LINE_RE.findall(data):
+            self.logger.warning(f"Invalid string format in {self.lang_code}.txt: '{line}'")
 
+        self._format_keys = {key for key, value in self._strings.items() if '{' in value}
         self.logger.info(f"Loaded {len(self._strings)} strings for '{self.lang_code}'.")
 
     def get_string(self, key, default=None):
@@ -44,13 +63,19 @@ class I18nManager:
         Retrieves a string by its key.
         Returns the default value if the key is not found.
         """
-        return self._strings.get(key, default if default is not None else f"[{key}]")
+        value = self._strings.get(key)
+        if value is not None:
+            return value
+        return default if default is not None else f"[{key}]"
 
     def get_text(self, key, *args, default=None):
         """
         Retrieves and formats a string with given arguments.
         """
         text = self.get_string(key, default)
+        # Loaded strings without placeholders never need formatting
+        if key in self._strings and key not in self._format_keys:
+            return text
         if args:
             try:
                 return text.format(*args)
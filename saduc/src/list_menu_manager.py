@@ -1,11 +1,97 @@
 from PyQt5.QtWidgets import QMenu, QAction
+from PyQt5.QtGui import QFont
 from functools import partial
 import main_window_actions as actions
+from ad_list_model import classify_object
+
+# Menu specs are tuples of entries:
+#   (i18n key, slot)  - an action calling slot(main_window)
+#   (i18n key, None)  - an empty submenu (placeholder for All Tasks)
+#   SEPARATOR         - a separator
+#   PROPERTIES        - the shared bold Properties action
+SEPARATOR = None
+PROPERTIES = 'properties'
+
+USER_MENU = (
+    ("context_menu.copy", actions.on_copy_user_action_triggered),
+    ("context_menu.add_to_group", actions.on_add_to_group_action_triggered),
+    ("context_menu.disable_account", actions.on_disable_user_action_triggered),
+    ("context_menu.reset_password", actions.on_reset_password_action_triggered),
+    ("context_menu.move", actions.on_move_action_triggered),
+    ("context_menu.open_home_page", actions.on_stub_action_triggered),
+    ("context_menu.send_mail", actions.on_stub_action_triggered),
+    SEPARATOR,
+    ("context_menu.all_tasks", None),
+    SEPARATOR,
+    ("context_menu.cut", actions.on_stub_action_triggered),
+    ("context_menu.delete", actions.on_delete_user_action_triggered),
+    ("context_menu.rename", actions.on_rename_action_triggered),
+    SEPARATOR,
+    PROPERTIES
+)
+
+COMPUTER_MENU = (
+    ("context_menu.add_to_group", actions.on_add_to_group_action_triggered),
+    # Hidden per right-click for domain controllers
+    ("context_menu.disable_account", actions.on_disable_user_action_triggered),
+    ("context_menu.reset_account", actions.on_reset_account_action_triggered),
+    ("context_menu.move", actions.on_move_action_triggered),
+    SEPARATOR,
+    ("context_menu.all_tasks", None),
+    SEPARATOR,
+    ("context_menu.cut", actions.on_stub_action_triggered),
+    ("context_menu.delete", actions.on_delete_user_action_triggered),
+    SEPARATOR,
+    PROPERTIES
+)
+
+GROUP_MENU = (
+    ("context_menu.add_to_group", actions.on_add_to_group_action_triggered),
+    ("context_menu.move", actions.on_move_action_triggered),
+    ("context_menu.send_mail", actions.on_stub_action_triggered),
+    SEPARATOR,
+    ("context_menu.all_tasks", None),
+    SEPARATOR,
+    ("context_menu.cut", actions.on_stub_action_triggered),
+    ("context_menu.delete", actions.on_delete_user_action_triggered),
+    ("context_menu.rename", actions.on_rename_action_triggered),
+    SEPARATOR,
+    PROPERTIES
+)
+
+CONTACT_MENU = (
+    ("context_menu.add_to_group", actions.on_add_to_group_action_triggered),
+    ("context_menu.move", actions.on_move_action_triggered),
+    ("context_menu.open_home_page", actions.on_stub_action_triggered),
+    ("context_menu.send_mail", actions.on_stub_action_triggered),
+    SEPARATOR,
+    ("context_menu.all_tasks", None),
+    SEPARATOR,
+    ("context_menu.cut", actions.on_stub_action_triggered),
+    ("context_menu.delete", actions.on_delete_user_action_triggered),
+    ("context_menu.rename", actions.on_rename_action_triggered),
+    SEPARATOR,
+    PROPERTIES
+)
+
+MENU_SPECS = {
+    'user': USER_MENU,
+    'computer': COMPUTER_MENU,
+    'group': GROUP_MENU,
+    'contact': CONTACT_MENU
+}
 
 class ListMenuManager:
     def __init__(self, main_window):
         self.main_window = main_window
         self.i18n = main_window.i18n
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        # A single Properties action is shared by every cached menu
+        self._properties_action = self._make_properties_action()
+        self._computer_disable_action = None
+        # Menus are built on first use of each kind and then reused
+        self._menus = {}
 
     def on_list_context_menu(self, position):
         self.main_window.logger.info("List context menu requested.")
@@ -18,98 +104,51 @@ class ListMenuManager:
             self.main_window.logger.warning("No valid data for selected table item.")
             return
 
-        obj_classes = selected_object_data.get('objectClass', [])
-        menu = QMenu()
-
-        if 'user' in obj_classes and 'computer' not in obj_classes:
-            self._build_user_menu(menu)
-        elif 'computer' in obj_classes:
-            self._build_computer_menu(menu, selected_object_data)
-        elif 'group' in obj_classes:
-            self._build_group_menu(menu)
-        elif 'contact' in obj_classes:
-            self._build_contact_menu(menu)
-
-        if not menu.isEmpty():
-            menu.exec_(self.main_window.listPane.viewport().mapToGlobal(position))
+        self.main_window.current_selected_dn = selected_object_data.get('dn')
+        self.main_window.current_selected_name = selected_object_data.get('name', 'Unknown')
+        kind = classify_object(self.main_window.tableModel.get_object_classes(index))
+        menu = self._get_menu(kind)
+        if menu is None:
+            return
 
-    def _build_user_menu(self, menu):
-        menu.addAction(self.i18n.get_string("context_menu.copy"), partial(actions.on_copy_user_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.add_to_group"), partial(actions.on_add_to_group_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.disable_account"), partial(actions.on_disable_user_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.reset_password"), partial(actions.on_reset_password_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.move"), partial(actions.on_move_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.open_home_page"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.send_mail"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addSeparator()
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        menu.addSeparator()
-        menu.addAction(self.i18n.get_string("context_menu.cut"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.delete"), partial(actions.on_delete_user_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.rename"), partial(actions.on_rename_action_triggered, self.main_window))
-        menu.addSeparator()
-        properties_action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
-        font = properties_action.font()
-        font.setBold(True)
-        properties_action.setFont(font)
-        properties_action.triggered.connect(partial(actions.on_properties_action_triggered, self.main_window))
-        menu.addAction(properties_action)
+        if kind == 'computer':
+            uac = int(selected_object_data.get('userAccountControl', '0'))
+            is_dc = bool(uac & 8192)  # UAC_SERVER_TRUST_ACCOUNT
+            self._computer_disable_action.setVisible(not is_dc)
 
-    def _build_computer_menu(self, menu, selected_object_data):
-        uac = int(selected_object_data.get('userAccountControl', '0'))
-        is_dc = bool(uac & 8192)  # UAC_SERVER_TRUST_ACCOUNT
+        menu.exec_(self.main_window.listPane.viewport().mapToGlobal(position))
 
-        menu.addAction(self.i18n.get_string("context_menu.add_to_group"), partial(actions.on_add_to_group_action_triggered, self.main_window))
-        if not is_dc:
-            menu.addAction(self.i18n.get_string("context_menu.disable_account"), partial(actions.on_disable_user_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.reset_account"), partial(actions.on_reset_account_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.move"), partial(actions.on_move_action_triggered, self.main_window))
-        menu.addSeparator()
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        menu.addSeparator()
-        menu.addAction(self.i18n.get_string("context_menu.cut"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.delete"), partial(actions.on_delete_user_action_triggered, self.main_window))
-        menu.addSeparator()
-        properties_action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
-        font = properties_action.font()
-        font.setBold(True)
-        properties_action.setFont(font)
-        properties_action.triggered.connect(partial(actions.on_properties_action_triggered, self.main_window))
-        menu.addAction(properties_action)
+    def _get_menu(self, kind):
+        menu = self._menus.get(kind)
+        if menu is None and kind in MENU_SPECS:
+            menu, added_actions = self._build_menu(MENU_SPECS[kind])
+            if kind == 'computer':
+                self._computer_disable_action = added_actions["context_menu.disable_account"]
+            self._menus[kind] = menu
+        return menu
 
-    def _build_group_menu(self, menu):
-        menu.addAction(self.i18n.get_string("context_menu.add_to_group"), partial(actions.on_add_to_group_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.move"), partial(actions.on_move_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.send_mail"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addSeparator()
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        menu.addSeparator()
-        menu.addAction(self.i18n.get_string("context_menu.cut"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.delete"), partial(actions.on_delete_user_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.rename"), partial(actions.on_rename_action_triggered, self.main_window))
-        menu.addSeparator()
-        properties_action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
-        font = properties_action.font()
-        font.setBold(True)
-        properties_action.setFont(font)
-        properties_action.triggered.connect(partial(actions.on_properties_action_triggered, self.main_window))
-        menu.addAction(properties_action)
+    def _make_properties_action(self):
+        action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
+        action.setFont(self._bold_font)
+        action.triggered.connect(partial(actions.on_properties_action_triggered, self.main_window))
+        return action
 
-    def _build_contact_menu(self, menu):
-        menu.addAction(self.i18n.get_string("context_menu.add_to_group"), partial(actions.on_add_to_group_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.move"), partial(actions.on_move_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.open_home_page"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.send_mail"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addSeparator()
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        menu.addSeparator()
-        menu.addAction(self.i18n.get_string("context_menu.cut"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.delete"), partial(actions.on_delete_user_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.rename"), partial(actions.on_rename_action_triggered, self.main_window))
-        menu.addSeparator()
-        properties_action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
-        font = properties_action.font()
-        font.setBold(True)
-        properties_action.setFont(font)
-        properties_action.triggered.connect(partial(actions.on_properties_action_triggered, self.main_window))
-        menu.addAction(properties_action)
\ No newline at end of file
+    def _build_menu(self, spec):
+        """
+        Builds a QMenu from a menu spec. Returns the menu and a dict of the
+        created actions keyed by their i18n key.
+        """
+        menu = QMenu(self.main_window)
+        added_actions = {}
+        for entry in spec:
+            if entry is SEPARATOR:
+                menu.addSeparator()
+            elif entry is PROPERTIES:
+                menu.addAction(self._properties_action)
+            else:
+                key, slot = entry
+                if slot is None:
+                    menu.addMenu(self.i18n.get_string(key))
+                else:
+                    added_actions[key] = menu.addAction(self.i18n.get_string(key), partial(slot, self.main_window))
+        return menu, added_actions
@@ -1,40 +1,132 @@
 # src/main.py
 import sys
+import time
+import atexit
+import queue
 import logging
+import logging.handlers
 from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtCore import QTimer, QObject, QRunnable, QThreadPool, QEventLoop, pyqtSignal
 from gui import SADUCMainWindow
-from samba_backend import get_ldap_conn, NoKerberosTicketError, BASE_DN
+from samba_backend import get_ldap_conn, obtain_kerberos_ticket, NoKerberosTicketError, KinitError, LdapConnectionError, DOMAIN_NAME
 from user_dialogs import UsernamePasswordDialog
-import subprocess
-from subprocess import CalledProcessError
 
 # --- Global Logger Configuration ---
+LOG_BUFFER_SIZE = 65536
+LOG_FLUSH_INTERVAL_MS = 5000
+
+# Handlers written to by the log listener, flushed periodically by flush_log()
+_logFlushHandlers = ()
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    A FileHandler that writes through a large buffer and leaves flushing to
+    flush_log() and shutdown, instead of flushing after every record.
+    """
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE, encoding=self.encoding or "utf-8")
+
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+def flush_log():
+    """
+    Writes any buffered debug log records out to the log file.
+    """
+    for handler in _logFlushHandlers:
+        handler.flush()
+
 def setup_logging():
     """
     Configures the global logging settings for the application.
     Output will go to both console and a debug file.
     """
+    global _logFlushHandlers
     logFile = "saduc_debug.log"
 
     logger = logging.getLogger("saduc_app")
     logger.setLevel(logging.DEBUG)
+    # No format uses the caller's file/line, so skip the stack frame lookup
+    # that logging otherwise does for every record.
+    logging._srcfile = None
+    # Our handlers are attached here; don't pass records on to the root logger.
+    logger.propagate = False
 
     if not logger.handlers:
         consoleHandler = logging.StreamHandler(sys.stdout)
         consoleHandler.setLevel(logging.INFO)
         consoleFormatter = logging.Formatter('%(levelname)s: %(message)s')
         consoleHandler.setFormatter(consoleFormatter)
-        logger.addHandler(consoleHandler)
 
-        fileHandler = logging.FileHandler(logFile)
+        fileHandler = BufferedFileHandler(logFile)
         fileHandler.setLevel(logging.DEBUG)
-        fileFormatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        # Time of day only; the date is logged once below when logging starts.
+        fileFormatter = logging.Formatter('%(asctime)s %(levelname).1s %(name)s: %(message)s', datefmt='%H:%M:%S')
         fileHandler.setFormatter(fileFormatter)
-        logger.addHandler(fileHandler)
+        # Batch file writes; anything at ERROR or above is written at once.
+        memoryHandler = logging.handlers.MemoryHandler(capacity=512, flushLevel=logging.ERROR, target=fileHandler)
+        memoryHandler.setLevel(logging.DEBUG)
+
+        # The GUI thread only enqueues records; the listener thread does
+        # the formatting and I/O.
+        logQueue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(logQueue))
+        listener = logging.handlers.QueueListener(logQueue, memoryHandler, consoleHandler, respect_handler_level=True)
+        listener.start()
+        _logFlushHandlers = (memoryHandler, fileHandler)
+        # atexit runs these in reverse: drain the queue, then flush the buffer.
+        atexit.register(memoryHandler.flush)
+        atexit.register(listener.stop)
 
-    logger.info(f"Logging initialized. Output to console (INFO+) and '{logFile}' (DEBUG+).")
+    logger.info(f"Logging initialized on {time.strftime('%Y-%m-%d')}. Output to console (INFO+) and '{logFile}' (DEBUG+).")
     return logger
 
+class _AuthSignals(QObject):
+    """Signals emitted by _AuthRunnable; delivered on the GUI thread."""
+    finished = pyqtSignal(object, object)
+
+
+class _AuthRunnable(QRunnable):
+    """
+    Runs one blocking authentication step (kinit or the LDAP bind) on a
+    QThreadPool worker and reports its result or exception.
+    """
+    def __init__(self, func, args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = _AuthSignals()
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.signals.finished.emit(None, e)
+            return
+        self.signals.finished.emit(result, None)
+
+
+def run_in_background(func, *args):
+    """
+    Calls func(*args) on a worker thread while a local event loop keeps the
+    GUI responsive, then returns its result or re-raises its exception.
+    """
+    outcome = []
+    loop = QEventLoop()
+    runnable = _AuthRunnable(func, args)
+    runnable.signals.finished.connect(lambda result, error: (outcome.extend((result, error)), loop.quit()))
+    QThreadPool.globalInstance().start(runnable)
+    loop.exec_()
+    result, error = outcome
+    if error is not None:
+        raise error
+    return result
+
 def get_authenticated_connection(appLogger, app):
     """
     Handles the authentication flow with Kerberos, including manual
@@ -42,9 +134,14 @@ def get_authenticated_connection(appLogger, app):
     """
     samba_conn = None
     connected_server = None
+    realm = DOMAIN_NAME.upper()
     while samba_conn is None:
         try:
-            samba_conn, connected_server = get_ldap_conn()
+            samba_conn, connected_server = run_in_background(get_ldap_conn)
+        except LdapConnectionError as e:
+            appLogger.error(f"Could not connect to a domain controller: {e}")
+            QMessageBox.critical(None, "Connection Failed", f"Could not connect to a domain controller for {DOMAIN_NAME}. Exiting application.\n\nDetails: {e}")
+            sys.exit(1)
         except NoKerberosTicketError:
             appLogger.warning(f"No Kerberos ticket found. Presenting manual authentication dialog.")
             
@@ -58,24 +155,17 @@ def get_authenticated_connection(appLogger, app):
                     continue
                 
                 # Construct the Kerberos principal from the username and domain
-                domain_parts = BASE_DN.split(',')
-                realm = ".".join([p.split('=')[1] for p in domain_parts]).upper()
                 principal = f"{username}@{realm}"
                 
                 try:
                     appLogger.info(f"Attempting kinit for principal: {principal}")
-                    subprocess.run(
-                        ['kinit', principal],
-                        input=password.encode('utf-8'),
-                        capture_output=True,
-                        check=True
-                    )
+                    run_in_background(obtain_kerberos_ticket, principal, password)
                     appLogger.info("kinit successful. A ticket has been obtained.")
                     # On successful kinit, the loop will run again and this time
                     # get_ldap_conn() should succeed, breaking the loop.
                     
-                except CalledProcessError as e:
-                    error_output = e.stderr.decode('utf-8').strip()
+                except KinitError as e:
+                    error_output = str(e)
                     appLogger.error(f"kinit failed. Error: {error_output}")
                     QMessageBox.critical(None, "Authentication Failed", f"kinit failed. Please check your username and password.\n\nDetails: {error_output}")
                     # Loop will continue to re-prompt
@@ -114,6 +204,11 @@ def main():
     window = SADUCMainWindow(samba_conn, connected_server)
     window.show()
 
+    # Keep the debug log reasonably current during interactive sessions
+    logFlushTimer = QTimer(window)
+    logFlushTimer.timeout.connect(flush_log)
+    logFlushTimer.start(LOG_FLUSH_INTERVAL_MS)
+
     appLogger.info("Application event loop started.")
     sys.exit(app.exec_())
 
@@ -1,39 +1,74 @@
 
-import logging
+import importlib
 from PyQt5.QtWidgets import QDialog, QMessageBox
-from PyQt5.QtCore import Qt
-from user_dialogs import NewUserWizard, CopyUserWizard, DeleteUserDialog, DisableUserDialog
 from samba_backend import create_user_samba, copy_user_samba, get_user_properties
-from user_properties import UserPropertiesDialog
-from computer_properties import ComputerPropertiesDialog
-from group_properties import GroupPropertiesDialog
-from container_properties import ContainerPropertiesDialog
-from find_dialog import FindObjectsDialog
+from ad_list_model import classify_object
+
+# Dialog modules are imported inside the handlers that use them, so startup
+# only pays for the dialogs the user actually opens.
+
+# userAccountControl flags carried over to the Copy User wizard
+UAC_FLAGS = (
+    ('user_cannot_change_password', 0x0040),
+    ('password_never_expires', 0x10000),
+    ('account_is_disabled', 0x0002)
+)
+
+def parse_uac(raw):
+    """Converts a raw userAccountControl value into a dict of wizard flags."""
+    uac = int(raw)
+    return {name: bool(uac & mask) for name, mask in UAC_FLAGS}
+
+def _titles(main_window):
+    """
+    Returns the common success and error message box titles, resolved on
+    first use with the main window's own i18n and kept on the window.
+    """
+    titles = getattr(main_window, '_common_titles', None)
+    if titles is None:
+        titles = (main_window.i18n.get_string("dialog.common.success.title"),
+                  main_window.i18n.get_string("dialog.common.error.title"))
+        main_window._common_titles = titles
+    return titles
+
+def invalidate_titles(main_window):
+    """Forgets the window's cached titles, e.g. after the UI language changes."""
+    main_window._common_titles = None
+
+def _report_user_result(main_window, success, message, new_object, container_dn):
+    """
+    Shows the outcome of a create/copy user operation and, on success, adds
+    the new user to the list if it is showing container_dn.
+    """
+    success_title, error_title = _titles(main_window)
+    if success:
+        QMessageBox.information(main_window, success_title, message)
+        main_window.add_listed_object(new_object, container_dn)
+    else:
+        QMessageBox.critical(main_window, error_title, message)
 
 def on_new_user_action_triggered(main_window):
-    main_window.logger.info("New User action triggered. Opening NewUserWizard.")
+    from user_dialogs import NewUserWizard
+    main_window.logger.debug("New User action triggered. Opening NewUserWizard.")
     wizard = NewUserWizard(main_window, container_dn=main_window.currentContainerDN)
     if wizard.exec_() == QDialog.Accepted:
-        main_window.logger.info("New User wizard was accepted.")
+        main_window.logger.debug("New User wizard was accepted.")
         user_data = wizard.user_data
         if user_data:
             user_data['container_dn'] = main_window.currentContainerDN
-            main_window.logger.info(f"User data collected from wizard: {user_data}")
-            success, message_key = create_user_samba(main_window.samba_conn, user_data)
+            main_window.logger.debug("User data collected from wizard: %s", user_data)
+            success, message_key, new_object = create_user_samba(main_window.samba_conn, user_data)
             message = main_window.i18n.get_string(message_key)
-            if success:
-                QMessageBox.information(main_window, main_window.i18n.get_string("dialog.common.success.title"), message)
-                main_window._on_tree_item_clicked(main_window.treePane.currentIndex())
-            else:
-                QMessageBox.critical(main_window, main_window.i18n.get_string("dialog.common.error.title"), message)
+            _report_user_result(main_window, success, message, new_object, user_data['container_dn'])
     else:
-        main_window.logger.info("New User wizard was rejected.")
+        main_window.logger.debug("New User wizard was rejected.")
 
 def on_copy_user_action_triggered(main_window):
     if not main_window.current_selected_dn:
         main_window.logger.warning("No user selected for copy.")
         return
 
+    from user_dialogs import CopyUserWizard
     source_user_props = get_user_properties(main_window.samba_conn, main_window.current_selected_dn)
     if not source_user_props:
         QMessageBox.critical(main_window, "Error", "Could not fetch properties for the source user.")
@@ -41,57 +76,62 @@ def on_copy_user_action_triggered(main_window):
 
     source_username = source_user_props.get('sAMAccountName', [''])[0]
     
-    uac = int(source_user_props.get('userAccountControl', ['0'])[0])
     initial_data = {
         'user_must_change_password': False,
-        'user_cannot_change_password': bool(uac & 0x0040),
-        'password_never_expires': bool(uac & 0x10000),
-        'account_is_disabled': bool(uac & 0x0002)
+        **parse_uac(source_user_props.get('userAccountControl', ['0'])[0])
     }
 
-    main_window.logger.info(f"Copy User action triggered for user: {source_username}.")
+    main_window.logger.debug("Copy User action triggered for user: %s.", source_username)
     wizard = CopyUserWizard(main_window, initial_data=initial_data, source_username=source_username, container_dn=main_window.currentContainerDN)
     if wizard.exec_() == QDialog.Accepted:
-        main_window.logger.info("Copy User wizard was accepted.")
+        main_window.logger.debug("Copy User wizard was accepted.")
         user_data = wizard.user_data
         if user_data:
             user_data['container_dn'] = main_window.currentContainerDN
-            main_window.logger.info(f"Copied user data collected from wizard: {user_data}")
-            success, message_key = copy_user_samba(main_window.samba_conn, source_username, user_data)
+            main_window.logger.debug("Copied user data collected from wizard: %s", user_data)
+            success, message_key, new_object = copy_user_samba(main_window.samba_conn, source_username, user_data)
             message = main_window.i18n.get_text(message_key, user_data.get('full_name'))
-            if success:
-                QMessageBox.information(main_window, main_window.i18n.get_string("dialog.common.success.title"), message)
-                main_window._on_tree_item_clicked(main_window.treePane.currentIndex())
-            else:
-                QMessageBox.critical(main_window, main_window.i18n.get_string("dialog.common.error.title"), message)
+            _report_user_result(main_window, success, message, new_object, user_data['container_dn'])
     else:
-        main_window.logger.info("Copy User wizard was rejected.")
+        main_window.logger.debug("Copy User wizard was rejected.")
 
 def on_delete_user_action_triggered(main_window):
     if not main_window.current_selected_dn:
         main_window.logger.warning("No user selected for deletion.")
         return
 
-    username = main_window.tableModel.data(main_window.listPane.selectionModel().currentIndex(), Qt.DisplayRole)
-    main_window.logger.info(f"Delete User action triggered for user: {username}.")
+    from user_dialogs import DeleteUserDialog
+    username = main_window.current_selected_name
+    main_window.logger.debug("Delete User action triggered for user: %s.", username)
     if DeleteUserDialog(main_window, username) == QMessageBox.Yes:
-        main_window.logger.info(f"User confirmed deletion of: {username}")
+        main_window.logger.debug("User confirmed deletion of: %s", username)
         QMessageBox.information(main_window, "Not Implemented", f"Backend logic to delete '{username}' is not yet implemented.")
     else:
-        main_window.logger.info(f"User cancelled deletion of: {username}")
+        main_window.logger.debug("User cancelled deletion of: %s", username)
 
 def on_disable_user_action_triggered(main_window):
     if not main_window.current_selected_dn:
         main_window.logger.warning("No user selected for disabling.")
         return
         
-    username = main_window.tableModel.data(main_window.listPane.selectionModel().currentIndex(), Qt.DisplayRole)
-    main_window.logger.info(f"Disable User action triggered for user: {username}.")
+    from user_dialogs import DisableUserDialog
+    username = main_window.current_selected_name
+    main_window.logger.debug("Disable User action triggered for user: %s.", username)
     if DisableUserDialog(main_window, username) == QMessageBox.Yes:
-        main_window.logger.info(f"User confirmed disabling account for: {username}")
+        main_window.logger.debug("User confirmed disabling account for: %s", username)
         QMessageBox.information(main_window, "Not Implemented", f"Backend logic to disable '{username}' is not yet implemented.")
     else:
-        main_window.logger.info(f"User cancelled disabling account for: {username}")
+        main_window.logger.debug("User cancelled disabling account for: %s", username)
+
+# Properties dialog for each list object kind, as (module, class name) so
+# the dialog module is only imported when first opened.
+PROPERTIES_DIALOGS = {
+    'user': ('user_properties', 'UserPropertiesDialog'),
+    'computer': ('computer_properties', 'ComputerPropertiesDialog'),
+    'group': ('group_properties', 'GroupPropertiesDialog'),
+    'container': ('container_properties', 'ContainerPropertiesDialog')
+}
+CONTAINER_CLASSES = frozenset(('container', 'organizationalUnit'))
 
 def on_properties_action_triggered(main_window):
     if not main_window.current_selected_dn:
@@ -99,148 +139,95 @@ def on_properties_action_triggered(main_window):
         return
 
     index = main_window.listPane.selectionModel().currentIndex()
-    selected_object_data = main_window.tableModel.get_object_data(index)
-    obj_classes = selected_object_data.get('objectClass', [])
-
-    if 'user' in obj_classes and 'computer' not in obj_classes:
-        dialog = UserPropertiesDialog(main_window.samba_conn, main_window.current_selected_dn, main_window)
-        dialog.exec_()
-    elif 'computer' in obj_classes:
-        dialog = ComputerPropertiesDialog(main_window.samba_conn, main_window.current_selected_dn, main_window)
-        dialog.exec_()
-    elif 'group' in obj_classes:
-        dialog = GroupPropertiesDialog(main_window.samba_conn, main_window.current_selected_dn, main_window)
-        dialog.exec_()
-    elif 'container' in obj_classes or 'organizationalUnit' in obj_classes:
-        dialog = ContainerPropertiesDialog(main_window.samba_conn, main_window.current_selected_dn, main_window)
-        dialog.exec_()
+    obj_classes = main_window.tableModel.get_object_classes(index)
+    kind = classify_object(obj_classes)
+    if kind is None and not obj_classes.isdisjoint(CONTAINER_CLASSES):
+        kind = 'container'
+
+    dialog_spec = PROPERTIES_DIALOGS.get(kind)
+    if dialog_spec is None:
+        return
+    module_name, class_name = dialog_spec
+    dialog_class = getattr(importlib.import_module(module_name), class_name)
+    dialog = dialog_class(main_window.samba_conn, main_window.current_selected_dn, main_window)
+    dialog.exec_()
 
 def on_find_user_action_triggered(main_window, dn):
-    main_window.logger.info(f"Find action triggered on DN: {dn}")
+    from find_dialog import FindObjectsDialog
+    main_window.logger.debug("Find action triggered on DN: %s", dn)
     dialog = FindObjectsDialog(main_window.samba_conn, search_base_dn=dn, parent=main_window)
     dialog.exec_()
 
-def on_add_to_group_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Add to a group...' is not yet implemented.")
-
-def on_reset_password_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Reset Password...' is not yet implemented.")
-
-def on_move_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Move...' is not yet implemented.")
-
-def on_rename_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Rename...' is not yet implemented.")
-
-def on_stub_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "This feature is not yet implemented.")
-
-def on_reset_account_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Reset Account' is not yet implemented.")
-
-def on_change_domain_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Change Domain...' is not yet implemented.")
+def on_find_in_current_container_action_triggered(main_window):
+    on_find_user_action_triggered(main_window, main_window.currentContainerDN)
+
+# Actions that only report they are not implemented yet, keyed by the
+# handler name the menus and toolbars connect to.
+_STUB_MESSAGES = {
+    "on_add_to_group_action_triggered": "'Add to a group...' is not yet implemented.",
+    "on_reset_password_action_triggered": "'Reset Password...' is not yet implemented.",
+    "on_move_action_triggered": "'Move...' is not yet implemented.",
+    "on_rename_action_triggered": "'Rename...' is not yet implemented.",
+    "on_stub_action_triggered": "This feature is not yet implemented.",
+    "on_reset_account_action_triggered": "'Reset Account' is not yet implemented.",
+    "on_change_domain_action_triggered": "'Change Domain...' is not yet implemented.",
+    "on_export_list_action_triggered": "'Export List...' is not yet implemented.",
+    "on_import_query_definition_action_triggered": "'Import Query Definition...' is not yet implemented.",
+    "on_delegate_control_action_triggered": "'Delegate Control...' is not yet implemented.",
+    "on_raise_domain_functional_level_action_triggered": "'Raise Domain functional level...' is not yet implemented.",
+    "on_operations_masters_action_triggered": "'Operations Masters...' is not yet implemented.",
+    "on_new_folder_action_triggered": "'New Folder...' is not yet implemented.",
+    "on_view_add_remove_columns_action_triggered": "'Add/Remove Columns...' is not yet implemented.",
+    "on_view_large_icons_action_triggered": "'Large Icons' view is not yet implemented.",
+    "on_view_small_icons_action_triggered": "'Small Icons' view is not yet implemented.",
+    "on_view_list_action_triggered": "'List' view is not yet implemented.",
+    "on_view_detail_action_triggered": "'Detail' view is not yet implemented.",
+    "on_view_filter_options_action_triggered": "'Filter options...' is not yet implemented.",
+    "on_view_customize_action_triggered": "'Customize...' is not yet implemented.",
+    "on_new_group_action_triggered": "'New Group...' is not yet implemented.",
+    "on_new_computer_action_triggered": "'New Computer...' is not yet implemented.",
+    "on_new_ou_action_triggered": "'New Organizational Unit...' is not yet implemented.",
+    "on_new_contact_action_triggered": "'New Contact...' is not yet implemented.",
+    "on_new_printer_action_triggered": "'New Printer...' is not yet implemented.",
+    "on_new_shared_folder_action_triggered": "'New Shared Folder...' is not yet implemented.",
+    "on_new_inetorgperson_action_triggered": "'New InetOrgPerson...' is not yet implemented.",
+    "on_new_msds_keycredential_action_triggered": "'New msDS-KeyCredential...' is not yet implemented.",
+    "on_new_msds_resourcepropertylist_action_triggered": "'New msDS-ResourcePropertyList...' is not yet implemented.",
+    "on_new_msds_shadowprincipalcontainer_action_triggered": "'New msDS-ShadowPrincipalContainer...' is not yet implemented.",
+    "on_new_msimaging_psps_action_triggered": "'New msImaging-PSPs...' is not yet implemented.",
+    "on_new_msmq_queue_alias_action_triggered": "'New MSMQ Queue Alias...' is not yet implemented.",
+    "on_new_query_action_triggered": "'New Query...' is not yet implemented.",
+    "on_delete_container_action_triggered": "'Delete' for containers is not yet implemented.",
+}
+
+def _make_stub(name, message):
+    def stub(main_window):
+        QMessageBox.information(main_window, "Not Implemented", message)
+    stub.__name__ = stub.__qualname__ = name
+    return stub
+
+for _name, _message in _STUB_MESSAGES.items():
+    globals()[_name] = _make_stub(_name, _message)
+del _name, _message
 
 def on_refresh_action_triggered(main_window):
-    main_window.logger.info("Refresh action triggered.")
+    main_window.logger.debug("Refresh action triggered.")
     current_index = main_window.treePane.currentIndex()
     if current_index.isValid():
         main_window._on_tree_item_clicked(current_index)
     else:
         main_window.logger.warning("No item selected in the tree to refresh.")
 
-def on_export_list_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Export List...' is not yet implemented.")
-
-def on_import_query_definition_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Import Query Definition...' is not yet implemented.")
-
-def on_delegate_control_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Delegate Control...' is not yet implemented.")
-
-def on_raise_domain_functional_level_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Raise Domain functional level...' is not yet implemented.")
-
-def on_operations_masters_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Operations Masters...' is not yet implemented.")
-
-def on_new_folder_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New Folder...' is not yet implemented.")
-
-def on_view_add_remove_columns_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Add/Remove Columns...' is not yet implemented.")
-
-def on_view_large_icons_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Large Icons' view is not yet implemented.")
-
-def on_view_small_icons_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Small Icons' view is not yet implemented.")
-
-def on_view_list_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'List' view is not yet implemented.")
-
-def on_view_detail_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Detail' view is not yet implemented.")
-
-def on_view_filter_options_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Filter options...' is not yet implemented.")
-
-def on_view_customize_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Customize...' is not yet implemented.")
-
 def on_view_users_as_containers_action_toggled(main_window, checked):
     QMessageBox.information(main_window, "Not Implemented", f"'Users as containers' toggled: {checked}")
 
 def on_advanced_features_toggled(main_window, checked):
-    main_window.logger.info(f"Advanced features toggled: {checked}")
+    main_window.logger.debug("Advanced features toggled: %s", checked)
     main_window.adModel.set_advanced_view(checked)
     main_window._setup_tree_view_model()
 
-def on_new_group_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New Group...' is not yet implemented.")
-
-def on_new_computer_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New Computer...' is not yet implemented.")
-
-def on_new_ou_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New Organizational Unit...' is not yet implemented.")
-
-def on_new_contact_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New Contact...' is not yet implemented.")
-
-def on_new_printer_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New Printer...' is not yet implemented.")
-
-def on_new_shared_folder_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New Shared Folder...' is not yet implemented.")
-
-def on_new_inetorgperson_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New InetOrgPerson...' is not yet implemented.")
-
-def on_new_msds_keycredential_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New msDS-KeyCredential...' is not yet implemented.")
-
-def on_new_msds_resourcepropertylist_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New msDS-ResourcePropertyList...' is not yet implemented.")
-
-def on_new_msds_shadowprincipalcontainer_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New msDS-ShadowPrincipalContainer...' is not yet implemented.")
-
-def on_new_msimaging_psps_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New msImaging-PSPs...' is not yet implemented.")
-
-def on_new_msmq_queue_alias_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New MSMQ Queue Alias...' is not yet implemented.")
-
-def on_new_query_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'New Query...' is not yet implemented.")
-
-def on_delete_container_action_triggered(main_window):
-    QMessageBox.information(main_window, "Not Implemented", "'Delete' for containers is not yet implemented.")
-
-from container_properties import ContainerPropertiesDialog
-
 def on_container_properties_action_triggered(main_window):
+    from container_properties import ContainerPropertiesDialog
     if not main_window.currentContainerDN:
         main_window.logger.warning("No container selected for properties.")
         return
@@ -249,12 +236,14 @@ def on_container_properties_action_triggered(main_window):
     dialog.exec_()
 
 def on_change_dc_action_triggered(main_window):
-    main_window.logger.info("Change Domain Controller action triggered.")
+    main_window.logger.debug("Change Domain Controller action triggered.")
     QMessageBox.information(main_window, "Not Implemented", "Changing the domain controller is not yet implemented.")
 
 def on_list_item_double_clicked(main_window, index):
     if not index.isValid():
         return
 
-    main_window.current_selected_dn = main_window.tableModel.get_object_data(index).get('dn')
+    selected_object_data = main_window.tableModel.get_object_data(index)
+    main_window.current_selected_dn = selected_object_data.get('dn')
+    main_window.current_selected_name = selected_object_data.get('name', 'Unknown')
     on_properties_action_triggered(main_window)
@@ -12,6 +12,10 @@
 # -----------------------------------------------------------------------------
 
 import logging
+import time
+import ldap
+import ldap.dn
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QDialog, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, 
     QLineEdit, QCheckBox, QPushButton, QDialogButtonBox, QComboBox,
@@ -21,7 +25,38 @@ from PyQt5.QtGui import QIcon, QPixmap
 from PyQt5.QtCore import Qt
 
 from i18n_manager import I18nManager
-from samba_backend import get_ntds_settings, get_query_policies, get_replication_connections, format_ldap_guid, BASE_DN
+from samba_backend import get_ntds_settings, get_query_policies, get_replication_connections, format_ldap_guid, DOMAIN_NAME
+
+# Header pixmap, decoded on first use and shared by all dialog instances
+_header_pixmap = None
+
+# Seconds a loaded NTDS Settings object stays cached between dialog opens
+NTDS_CACHE_TTL = 30
+# ntds_dn -> (load time, (props, policies, (from_conns, to_conns)))
+_ntds_cache = {}
+
+def _cached_ntds_load(samba_conn, ntds_dn):
+    """
+    Returns the NTDS settings, query policies and replication connections
+    for ntds_dn, reusing the previous result if it is recent enough.
+    """
+    now = time.monotonic()
+    cached = _ntds_cache.get(ntds_dn)
+    if cached and now - cached[0] < NTDS_CACHE_TTL:
+        return cached[1]
+
+    # The three lookups are independent, so issue them together rather than
+    # waiting for each round trip in turn.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        props_future = executor.submit(get_ntds_settings, samba_conn, ntds_dn)
+        policies_future = executor.submit(get_query_policies, samba_conn)
+        conns_future = executor.submit(get_replication_connections, samba_conn, ntds_dn)
+        props = props_future.result()
+        if not props:
+            return props, [], ([], [])
+        data = (props, policies_future.result(), conns_future.result())
+    _ntds_cache[ntds_dn] = (now, data)
+    return data
 
 class NtdsSettingsDialog(QDialog):
     """Dialog for viewing and editing NTDS Settings properties."""
@@ -29,6 +64,8 @@ class NtdsSettingsDialog(QDialog):
         super().__init__(parent)
         self.samba_conn = samba_conn
         self.ntds_dn = ntds_dn
+        # Query policy CN -> index in query_policy_combo
+        self._policy_index = {}
         self.logger = logging.getLogger("saduc_app." + self.__class__.__name__)
         self.i18n = I18nManager()
 
@@ -41,8 +78,11 @@ class NtdsSettingsDialog(QDialog):
 
     def _create_widgets(self):
         # Header
+        global _header_pixmap
+        if _header_pixmap is None:
+            _header_pixmap = QIcon("src/res/icons/site_settings.png").pixmap(32, 32)
         self.header_icon = QLabel()
-        self.header_icon.setPixmap(QIcon("src/res/icons/site_settings.png").pixmap(32, 32))
+        self.header_icon.setPixmap(_header_pixmap)
         self.header_label = QLabel("<b>NTDS Settings</b>")
 
         # Tabs
@@ -66,6 +106,8 @@ class NtdsSettingsDialog(QDialog):
         # Dialog buttons
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.Apply)
         self.button_box.accepted.connect(self.accept)
+        self.button_box.accepted.connect(self._invalidate_cache)
+        self.button_box.button(QDialogButtonBox.Apply).clicked.connect(self._invalidate_cache)
         self.button_box.rejected.connect(self.reject)
 
     def _create_layout(self):
@@ -116,31 +158,47 @@ class NtdsSettingsDialog(QDialog):
         table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
         table.verticalHeader().hide()
 
+    def _invalidate_cache(self):
+        _ntds_cache.pop(self.ntds_dn, None)
+
     def _load_data(self):
-        ntds_props = get_ntds_settings(self.samba_conn, self.ntds_dn)
+        # Nothing needs to react to the initial values, so keep the widgets
+        # quiet while they are filled in.
+        widgets = (self.description_edit, self.query_policy_combo, self.dns_alias_edit,
+                   self.global_catalog_check, self.replicate_from_table, self.replicate_to_table)
+        old_states = [widget.blockSignals(True) for widget in widgets]
+        try:
+            self._fill_fields()
+        finally:
+            for widget, old_state in zip(widgets, old_states):
+                widget.blockSignals(old_state)
+
+    def _fill_fields(self):
+        ntds_props, policies, (from_conns, to_conns) = _cached_ntds_load(self.samba_conn, self.ntds_dn)
         if not ntds_props:
             self.logger.error(f"Could not load NTDS Settings for DN: {self.ntds_dn}")
             return
 
         self.description_edit.setText(ntds_props.get('description', [''])[0])
         
-        policies = get_query_policies(self.samba_conn)
+        self._policy_index = {policy: i for i, policy in enumerate(policies)}
         self.query_policy_combo.addItems(policies)
+        current_policy_cn = "Default Query Policy"
         current_policy_dn = ntds_props.get('queryPolicyObject', [None])[0]
         if current_policy_dn:
             try:
-                current_policy_cn = current_policy_dn.split(',')[0].split('=')[1]
-                self.query_policy_combo.setCurrentText(current_policy_cn)
-            except IndexError:
+                current_policy_cn = ldap.dn.str2dn(current_policy_dn)[0][0][1]
+            except (ldap.DECODING_ERROR, IndexError):
+                current_policy_cn = None
                 self.logger.warning(f"Could not parse CN from query policy DN: {current_policy_dn}")
-        else:
-            self.query_policy_combo.setCurrentText("Default Query Policy")
+        policy_index = self._policy_index.get(current_policy_cn)
+        if policy_index is not None:
+            self.query_policy_combo.setCurrentIndex(policy_index)
 
         guid_bytes = ntds_props.get('objectGUID')
         if guid_bytes:
             guid_str = format_ldap_guid(guid_bytes)
-            domain_name = ".".join(p.split('=')[1] for p in BASE_DN.split(',') if p.lower().startswith('dc='))
-            dns_alias = f"{guid_str}._msdcs.{domain_name}"
+            dns_alias = f"{guid_str}._msdcs.{DOMAIN_NAME}"
             self.dns_alias_edit.setText(dns_alias)
 
         options = int(ntds_props.get('options', ['0'])[0])
@@ -149,14 +207,17 @@ class NtdsSettingsDialog(QDialog):
         else:
             self.global_catalog_check.setChecked(False)
 
-        from_conns, to_conns = get_replication_connections(self.samba_conn, self.ntds_dn)
         self._populate_connections_table(self.replicate_from_table, from_conns)
         self._populate_connections_table(self.replicate_to_table, to_conns)
 
     def _populate_connections_table(self, table, connections):
-        table.setRowCount(0)
-        for conn in connections:
-            row = table.rowCount()
-            table.insertRow(row)
-            table.setItem(row, 0, QTableWidgetItem(conn.get('name', 'N/A')))
-            table.setItem(row, 1, QTableWidgetItem(conn.get('site', 'N/A')))
\ No newline at end of file
+        # Size the table once and fill it with updates off, rather than
+        # relaying out the table for every inserted row.
+        table.setUpdatesEnabled(False)
+        try:
+            table.setRowCount(len(connections))
+            for row, conn in enumerate(connections):
+                table.setItem(row, 0, QTableWidgetItem(conn.get('name', 'N/A')))
+                table.setItem(row, 1, QTableWidgetItem(conn.get('site', 'N/A')))
+        finally:
+            table.setUpdatesEnabled(True)
\ No newline at end of file
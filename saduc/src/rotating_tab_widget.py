@@ -12,16 +12,40 @@
 #
 # -----------------------------------------------------------------------------
 
+import functools
 import logging
+from contextlib import contextmanager
+from itertools import accumulate
+from bisect import bisect_right
 from PyQt5.QtWidgets import (
     QWidget, QStackedWidget, QVBoxLayout, QStyle, QStylePainter, QStyleOptionTab,
     QTabBar
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QRect, QPoint
-from PyQt5.QtGui import QIcon, QPainter, QColor, QFontMetrics, QPainterPath
+from PyQt5.QtCore import Qt, pyqtSignal, QRect, QPoint, QEvent
+from PyQt5.QtGui import QIcon, QPainter, QColor, QFont, QFontMetrics, QPainterPath, QPixmap, QRegion
 
 from . import tab_styles
 
+# Style enums used in every paint, resolved once
+_TAB_SHAPE = QStyle.CE_TabBarTabShape
+_TAB_LABEL = QStyle.CE_TabBarTabLabel
+_STATE_ENABLED = QStyle.State_Enabled
+_STATE_SELECTED = QStyle.State_Enabled | QStyle.State_Selected
+_ALIGN_CENTER = Qt.AlignCenter
+# Shared placeholder for tabs added without an icon
+_EMPTY_ICON = QIcon()
+
+@functools.lru_cache(maxsize=1024)
+def _text_advance(text, font_desc):
+    """
+    Returns the width of text in the font described by font_desc (a
+    QFont.toString() value). Shared by all tab bars, since the same labels
+    recur across dialogs.
+    """
+    font = QFont()
+    font.fromString(font_desc)
+    return QFontMetrics(font).horizontalAdvance(text)
+
 class RotatingTabBar(QWidget):
     currentChanged = pyqtSignal(int)
 
@@ -33,57 +57,145 @@ class RotatingTabBar(QWidget):
             self.logger = logging.getLogger(self.__class__.__name__)
             if not self.logger.handlers:
                 self.logger.addHandler(logging.NullHandler())
-        self._tabs = []
+        # Per-tab data, stored as parallel lists indexed by tab
+        self._tab_texts = []
+        self._tab_icons = []
+        self._tab_rects = []
+        self._tab_widths = []
         self._rows = []
         self._current_index = -1
         self._tabs_per_row = 0
         self._tab_style = tab_styles.STYLE_DEFAULT
+        # Paint method for the current style, resolved in setTabStyle()
+        self._drawer = self._paint_default_tabs
+        # Font metrics, row height and per-tab text widths are cached and
+        # only refreshed when the font or tab style changes.
+        self._fm = None
+        self._font_desc = ""
+        self._row_height = 0
+        # Inputs of the last _calculate_geometry() run; None forces a rerun
+        self._geom_key = None
+        # Hit-test tables: top of each row, and left edge of each tab in it
+        self._row_y_edges = []
+        self._row_x_edges = []
+        # Rounded tab outlines at the origin, keyed by (width, height, radius)
+        self._path_cache = {}
+        # Back rows rendered once and blitted; the key records what they show
+        self._back_pixmap = None
+        self._back_pixmap_key = None
+        # Rounded style colors resolved against the palette; None = stale
+        self._rounded_color_cache = None
+        # Nesting depth of beginAddTabs(); relayout waits until it is zero
+        self._bulk_depth = 0
+        self._geom_dirty = False
+        self._update_metrics()
         self.setMinimumHeight(60)
 
-    def setTabsPerRow(self, count):
-        self._tabs_per_row = count
+    def _update_metrics(self):
+        self._geom_key = None
+        self._fm = QFontMetrics(self.font())
+        self._font_desc = self.font().toString()
+        self._row_height = self._fm.height() + self._tab_style.get("padding", 10)
+        self._tab_widths = [_text_advance(text, self._font_desc) for text in self._tab_texts]
+
+    def _relayout(self):
+        if self._bulk_depth:
+            self._geom_dirty = True
+            return
         self._calculate_geometry()
         self.update()
 
+    def beginAddTabs(self):
+        self._bulk_depth += 1
+
+    def endAddTabs(self):
+        self._bulk_depth -= 1
+        if self._bulk_depth == 0 and self._geom_dirty:
+            self._geom_dirty = False
+            self._relayout()
+
+    @contextmanager
+    def bulk_add(self):
+        """Defers relayout until a batch of tab changes is finished."""
+        self.beginAddTabs()
+        try:
+            yield self
+        finally:
+            self.endAddTabs()
+
+    def setTabsPerRow(self, count):
+        if count == self._tabs_per_row:
+            return
+        self._tabs_per_row = count
+        self._geom_key = None
+        self._relayout()
+
     def setTabStyle(self, style):
+        # Styles are module-level dicts in tab_styles, so identity is enough
+        if style is self._tab_style:
+            return
         self._tab_style = style
-        self._calculate_geometry()
-        self.update()
+        self._rounded_color_cache = None
+        drawer_func_name = style.get("drawer", "_paint_default_tabs")
+        self._drawer = getattr(self, drawer_func_name, self._paint_default_tabs)
+        self._path_cache.clear()
+        self._update_metrics()
+        self._relayout()
 
     def addTab(self, text, icon=None):
-        tab_data = {"text": text, "icon": icon or QIcon(), "rect": QRect()}
-        self._tabs.append(tab_data)
-        self._calculate_geometry()
-        self.update()
-        return len(self._tabs) - 1
+        self._tab_texts.append(text)
+        self._tab_icons.append(icon if icon is not None else _EMPTY_ICON)
+        self._tab_rects.append(QRect())
+        self._tab_widths.append(_text_advance(text, self._font_desc))
+        self._geom_key = None
+        self._relayout()
+        return len(self._tab_texts) - 1
 
     def setCurrentIndex(self, index):
-        if 0 <= index < len(self._tabs):
+        if 0 <= index < len(self._tab_texts):
             if self._current_index != index:
+                old_index = self._current_index
+                front_row = self._rows[-1] if self._rows else None
                 self._current_index = index
                 self._rotate_to_make_tab_visible(index)
                 self.currentChanged.emit(index)
-                self.update()
+                if old_index >= 0 and self._rows and self._rows[-1] is front_row:
+                    # Same front row: only the old and new tabs look different
+                    dirty = QRegion(self._tab_rects[old_index]).united(QRegion(self._tab_rects[index]))
+                    self.update(dirty)
+                else:
+                    self.update()
 
     def _calculate_geometry(self):
-        if not self._tabs:
+        if not self._tab_texts:
+            return
+
+        # Resizes that don't change the width (or anything else the layout
+        # depends on) leave the rows and tab rects as they are.
+        geom_key = (self.width(), len(self._tab_texts), id(self._tab_style), self._row_height, self._tabs_per_row)
+        if geom_key == self._geom_key:
             return
+        self._geom_key = geom_key
+        self._path_cache.clear()
+        self._back_pixmap_key = None
 
-        fm = QFontMetrics(self.font())
         padding = self._tab_style.get("padding", 10)
         icon_size = 20
-        row_height = fm.height() + padding
+        row_height = self._row_height
         y_offset_factor = self._tab_style.get("y_offset_factor", 5)
         
+        # Iconless tabs don't reserve room for an icon
+        full_widths = [text_width + padding * 2 + (icon_size if icon is not _EMPTY_ICON else 0)
+                       for text_width, icon in zip(self._tab_widths, self._tab_icons)]
+
         self._rows = []
         if self._tabs_per_row > 0:
-            tab_indices = list(range(len(self._tabs)))
+            tab_indices = list(range(len(self._tab_texts)))
             self._rows = [tab_indices[i:i+self._tabs_per_row] for i in range(0, len(tab_indices), self._tabs_per_row)]
         else:
             current_row = []
             x = 5
-            for i, tab in enumerate(self._tabs):
-                tab_width = fm.width(tab["text"]) + padding * 2 + icon_size
+            for i, tab_width in enumerate(full_widths):
                 if x + tab_width > self.width() and len(current_row) > 0:
                     self._rows.append(current_row)
                     current_row = []
@@ -96,28 +208,28 @@ class RotatingTabBar(QWidget):
         for row in self._rows:
             if not row:
                 continue
-            tab_widths = [fm.width(self._tabs[i]["text"]) + padding * 2 + icon_size for i in row]
+            tab_widths = [full_widths[i] for i in row]
             total_width = sum(tab_widths)
-            x = 5
             if total_width < self.width() - 5:
+                # Share the spare width out evenly; the last tab takes the
+                # remainder so the row ends flush with the right edge.
                 remaining_space = self.width() - 5 - total_width
-                extra_width_per_tab = remaining_space / len(row)
-                for i, tab_index in enumerate(row):
-                    new_width = int(tab_widths[i] + extra_width_per_tab)
-                    self._tabs[tab_index]["rect"] = QRect(x, 0, new_width, row_height)
-                    x += new_width
-            else:
-                for i, tab_index in enumerate(row):
-                    self._tabs[tab_index]["rect"] = QRect(x, 0, tab_widths[i], row_height)
-                    x += tab_widths[i]
+                extra_width_per_tab, leftover = divmod(remaining_space, len(row))
+                tab_widths = [width + extra_width_per_tab for width in tab_widths]
+                tab_widths[-1] += leftover
+            xs = accumulate(tab_widths, initial=5)
+            for tab_index, x, width in zip(row, xs, tab_widths):
+                self._tab_rects[tab_index] = QRect(x, 0, width, row_height)
 
         self._rotate_to_make_tab_visible(self._current_index)
+        self._place_rows()
         new_height = (len(self._rows) * (row_height - y_offset_factor)) + y_offset_factor
         if self.height() != new_height:
             self.setMinimumHeight(new_height)
 
     def _rotate_to_make_tab_visible(self, index):
-        if index < 0 or not self._rows:
+        if index < 0 or not self._rows or index in self._rows[-1]:
+            # Already in the front row; nothing to rotate
             return
         target_row_index = -1
         for i, row in enumerate(self._rows):
@@ -127,104 +239,187 @@ class RotatingTabBar(QWidget):
         if target_row_index != -1 and target_row_index != len(self._rows) - 1:
             target_row = self._rows.pop(target_row_index)
             self._rows.append(target_row)
+            self._place_rows()
+
+    def _place_rows(self):
+        # Bake each row's vertical offset into its tab rects, so painting and
+        # hit-testing can use the rects as they are.
+        y_offset_factor = self._tab_style.get("y_offset_factor", 5)
+        self._row_y_edges = []
+        self._row_x_edges = []
+        for i, row in enumerate(self._rows):
+            y_pos = i * (self._row_height - y_offset_factor)
+            for tab_index in row:
+                self._tab_rects[tab_index].moveTop(y_pos)
+            self._row_y_edges.append(y_pos)
+            self._row_x_edges.append([self._tab_rects[tab_index].left() for tab_index in row])
 
     def paintEvent(self, event):
-        drawer_func_name = self._tab_style.get("drawer", "_paint_default_tabs")
-        drawer_func = getattr(self, drawer_func_name, self._paint_default_tabs)
-        drawer_func(event)
+        self._drawer(event)
 
-    def _paint_default_tabs(self, event):
-        painter = QStylePainter(self)
+    def _back_rows_pixmap(self, draw_func):
+        """
+        Returns the back (non-front) rows rendered by draw_func into a
+        pixmap, re-rendering only when the rows, size or style change.
+        """
+        back_rows = self._rows[:-1]
+        if not back_rows:
+            return None
+        key = (self.width(), self.height(), id(self._tab_style), draw_func.__name__, tuple(tuple(row) for row in back_rows))
+        if key != self._back_pixmap_key:
+            ratio = self.devicePixelRatioF()
+            pixmap = QPixmap(self.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            draw_func(pixmap, back_rows)
+            self._back_pixmap = pixmap
+            self._back_pixmap_key = key
+        return self._back_pixmap
+
+    def _draw_default_back_rows(self, device, rows):
+        painter = QStylePainter(device, self)
+        texts, icons, rects = self._tab_texts, self._tab_icons, self._tab_rects
+        draw = painter.drawControl
         opt = QStyleOptionTab()
-        padding = self._tab_style.get("padding", 10)
-        y_offset_factor = self._tab_style.get("y_offset_factor", 5)
-        row_height = QFontMetrics(self.font()).height() + padding
-        
-        for i, row in enumerate(self._rows[:-1]):
-            y_pos = i * (row_height - y_offset_factor)
+        opt.initFrom(self)
+        opt.palette.setColor(opt.palette.Button, self._tab_style["colors"].get("bg_back"))
+        opt.state = _STATE_ENABLED
+        last_icon = None
+        for row in rows:
             for tab_index in row:
-                tab = self._tabs[tab_index]
-                opt.initFrom(self)
-                opt.rect = tab["rect"].translated(0, y_pos)
-                opt.text = tab["text"]
-                opt.icon = tab["icon"]
-                opt.state = QStyle.State_Enabled
-                opt.palette.setColor(opt.palette.Button, self._tab_style["colors"].get("bg_back"))
-                painter.drawControl(QStyle.CE_TabBarTabShape, opt)
-                painter.drawControl(QStyle.CE_TabBarTabLabel, opt)
-        
+                opt.rect = rects[tab_index]
+                opt.text = texts[tab_index]
+                if icons[tab_index] is not last_icon:
+                    last_icon = opt.icon = icons[tab_index]
+                draw(_TAB_SHAPE, opt)
+                draw(_TAB_LABEL, opt)
+        painter.end()
+
+    def _paint_default_tabs(self, event):
+        back_pixmap = self._back_rows_pixmap(self._draw_default_back_rows)
+        painter = QStylePainter(self)
+        if back_pixmap is not None:
+            painter.drawPixmap(0, 0, back_pixmap)
+
         if self._rows:
-            front_row_y = (len(self._rows) - 1) * (row_height - y_offset_factor)
+            texts, icons, rects = self._tab_texts, self._tab_icons, self._tab_rects
+            draw = painter.drawControl
+            current_index = self._current_index
+            # Front row tabs use the widget's own palette
+            opt = QStyleOptionTab()
+            opt.initFrom(self)
+            last_icon = None
             for tab_index in self._rows[-1]:
-                tab = self._tabs[tab_index]
-                opt.initFrom(self)
-                opt.rect = tab["rect"].translated(0, front_row_y)
-                opt.text = tab["text"]
-                opt.icon = tab["icon"]
-                opt.state = QStyle.State_Enabled
-                if tab_index == self._current_index:
-                    opt.state |= QStyle.State_Selected
-                else:
-                    opt.palette.setColor(opt.palette.Button, self.palette().color(self.palette().Button))
-                painter.drawControl(QStyle.CE_TabBarTabShape, opt)
-                painter.drawControl(QStyle.CE_TabBarTabLabel, opt)
+                opt.rect = rects[tab_index]
+                opt.text = texts[tab_index]
+                if icons[tab_index] is not last_icon:
+                    last_icon = opt.icon = icons[tab_index]
+                opt.state = _STATE_SELECTED if tab_index == current_index else _STATE_ENABLED
+                draw(_TAB_SHAPE, opt)
+                draw(_TAB_LABEL, opt)
+
+    def _rounded_colors(self):
+        """
+        Returns the rounded style's colors resolved against the palette:
+        (bg_selected, text_selected, bg_back, text_back, pen). Cached until
+        the style or palette changes.
+        """
+        if self._rounded_color_cache is not None:
+            return self._rounded_color_cache
+        colors = self._tab_style.get("colors", {})
+        palette = self.palette()
+        self._rounded_color_cache = (
+            colors.get("bg_selected") or palette.color(palette.Highlight),
+            colors.get("text_selected") or palette.color(palette.HighlightedText),
+            colors.get("bg_back") or QColor(Qt.lightGray),
+            colors.get("text_back") or palette.color(palette.ButtonText),
+            # For the gap, use a pen with the window's background color
+            palette.color(palette.Window)
+        )
+        return self._rounded_color_cache
+
+    def _draw_rounded_back_rows(self, device, rows):
+        painter = QPainter(device)
+        painter.setRenderHint(QPainter.Antialiasing)
+        colors = self._rounded_colors()
+        border_radius = self._tab_style.get("border_radius", 15)
+        for row in rows:
+            for tab_index in row:
+                self._draw_rounded_tab(painter, tab_index, colors, border_radius)
+        painter.end()
 
     def _paint_rounded_tabs(self, event):
+        back_pixmap = self._back_rows_pixmap(self._draw_rounded_back_rows)
         painter = QPainter(self)
+        if back_pixmap is not None:
+            painter.drawPixmap(0, 0, back_pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
-        fm = QFontMetrics(self.font())
-        padding = self._tab_style.get("padding", 20)
-        border_radius = self._tab_style.get("border_radius", 15)
-        y_offset_factor = self._tab_style.get("y_offset_factor", 10)
-        row_height = fm.height() + padding
-        colors = self._tab_style.get("colors", {})
+        if self._rows:
+            colors = self._rounded_colors()
+            border_radius = self._tab_style.get("border_radius", 15)
+            for tab_index in self._rows[-1]:
+                self._draw_rounded_tab(painter, tab_index, colors, border_radius)
 
-        for i, row in enumerate(self._rows):
-            y_pos = i * (row_height - y_offset_factor)
-            for tab_index in row:
-                tab = self._tabs[tab_index]
-                rect = tab["rect"].translated(0, y_pos)
-                is_selected = (tab_index == self._current_index)
-
-                if is_selected:
-                    bg_color = colors.get("bg_selected") or self.palette().color(self.palette().Highlight)
-                    text_color = colors.get("text_selected") or self.palette().color(self.palette().HighlightedText)
-                else: # Not selected
-                    bg_color = colors.get("bg_back") or QColor(Qt.lightGray)
-                    text_color = colors.get("text_back") or self.palette().color(self.palette().ButtonText)
-
-                # For the gap, use a pen with the window's background color
-                pen_color = self.palette().color(self.palette().Window)
-                painter.setPen(pen_color)
-                painter.setBrush(bg_color)
-                
-                path = QPainterPath()
-                path.moveTo(rect.bottomLeft())
-                path.lineTo(rect.topLeft() + QPoint(0, border_radius))
-                path.arcTo(rect.left(), rect.top(), border_radius * 2, border_radius * 2, 180, -90)
-                path.lineTo(rect.topRight() - QPoint(border_radius, 0))
-                path.arcTo(rect.right() - border_radius * 2, rect.top(), border_radius * 2, border_radius * 2, 90, -90)
-                path.lineTo(rect.bottomRight())
-                path.closeSubpath()
-                painter.drawPath(path)
-
-                painter.setPen(text_color)
-                painter.drawText(rect, Qt.AlignCenter, tab["text"])
+    def _draw_rounded_tab(self, painter, tab_index, colors, border_radius):
+        bg_selected, text_selected, bg_back, text_back, pen_color = colors
+        rect = self._tab_rects[tab_index]
+
+        if tab_index == self._current_index:
+            bg_color, text_color = bg_selected, text_selected
+        else: # Not selected
+            bg_color, text_color = bg_back, text_back
+
+        painter.setPen(pen_color)
+        painter.setBrush(bg_color)
+
+        top_left = rect.topLeft()
+        painter.translate(top_left)
+        painter.drawPath(self._rounded_path(rect.width(), rect.height(), border_radius))
+        painter.translate(-top_left)
+
+        painter.setPen(text_color)
+        painter.drawText(rect, _ALIGN_CENTER, self._tab_texts[tab_index])
+
+    def _rounded_path(self, width, height, border_radius):
+        key = (width, height, border_radius)
+        path = self._path_cache.get(key)
+        if path is None:
+            rect = QRect(0, 0, width, height)
+            path = QPainterPath()
+            path.moveTo(rect.bottomLeft())
+            path.lineTo(rect.topLeft() + QPoint(0, border_radius))
+            path.arcTo(rect.left(), rect.top(), border_radius * 2, border_radius * 2, 180, -90)
+            path.lineTo(rect.topRight() - QPoint(border_radius, 0))
+            path.arcTo(rect.right() - border_radius * 2, rect.top(), border_radius * 2, border_radius * 2, 90, -90)
+            path.lineTo(rect.bottomRight())
+            path.closeSubpath()
+            self._path_cache[key] = path
+        return path
 
     def mousePressEvent(self, event):
-        fm = QFontMetrics(self.font())
-        padding = self._tab_style.get("padding", 10)
-        y_offset_factor = self._tab_style.get("y_offset_factor", 5)
-        row_height = fm.height() + padding
-        for i, row in enumerate(self._rows):
-            y_pos = i * (row_height - y_offset_factor)
-            for tab_index in row:
-                tab = self._tabs[tab_index]
-                if tab["rect"].translated(0, y_pos).contains(event.pos()):
-                    self.setCurrentIndex(tab_index)
-                    return
+        # Rows overlap by y_offset_factor; the lower row is drawn on top, so
+        # it wins within the overlap.
+        pos = event.pos()
+        row_index = bisect_right(self._row_y_edges, pos.y()) - 1
+        if 0 <= row_index < len(self._rows) and pos.y() < self._row_y_edges[row_index] + self._row_height:
+            row = self._rows[row_index]
+            col_index = bisect_right(self._row_x_edges[row_index], pos.x()) - 1
+            if 0 <= col_index < len(row) and pos.x() <= self._tab_rects[row[col_index]].right():
+                self.setCurrentIndex(row[col_index])
+                return
         super().mousePressEvent(event)
 
+    def changeEvent(self, event):
+        if event.type() == QEvent.PaletteChange:
+            self._back_pixmap_key = None
+            self._rounded_color_cache = None
+        elif event.type() in (QEvent.FontChange, QEvent.StyleChange):
+            self._back_pixmap_key = None
+            self._update_metrics()
+            self._calculate_geometry()
+            self.update()
+        super().changeEvent(event)
+
     def resizeEvent(self, event):
         self._calculate_geometry()
         self.update()
@@ -258,6 +453,9 @@ class RotatingTabWidget(QWidget):
     def widget(self, index):
         return self._stack.widget(index)
 
+    def bulk_add(self):
+        return self._tab_bar.bulk_add()
+
     def currentIndex(self):
         return self._stack.currentIndex()
 
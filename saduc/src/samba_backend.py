@@ -13,32 +13,87 @@
 #
 # -----------------------------------------------------------------------------
 
+import functools
 import logging
+import os
+import re
 import ldap
+import ldap.dn
+import ldap.ldapobject
 import ldap.sasl
 from ldap.controls import SimplePagedResultsControl
 import dns.resolver
 import subprocess
 import sys
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Optional: the krb5 or gssapi bindings let us obtain a ticket in-process,
+# without passing the password through a pipe, and gssapi also lets us check
+# for an existing ticket. Without them we fall back to the kinit and klist
+# binaries.
+try:
+    import krb5
+except ImportError:
+    krb5 = None
+try:
+    import gssapi
+    import gssapi.exceptions
+    import gssapi.raw
+except ImportError:
+    gssapi = None
 
 # --- Custom Exception ---
 class NoKerberosTicketError(Exception):
     """Raised when no valid Kerberos ticket is found."""
     pass
 
+class KinitError(Exception):
+    """Raised when a Kerberos ticket could not be obtained."""
+    pass
+
+class LdapConnectionError(Exception):
+    """Raised when no LDAP server could be found or connected to."""
+    pass
+
 # --- Global Configuration ---
 logger = logging.getLogger("saduc_app." + __name__)
 
 BASE_DN = 'dc=home,dc=lucasit,dc=com'
+# Matches the value of each DC= component of a DN
+_DC_RE = re.compile(r'(?:^|,)\s*dc=([^,]+)', re.IGNORECASE)
+
+def dn_to_domain(dn):
+    """Converts the DC= components of a DN into a DNS domain name."""
+    return '.'.join(_DC_RE.findall(dn))
+
+# DNS domain name derived from BASE_DN, e.g. 'home.lucasit.com'
+DOMAIN_NAME = dn_to_domain(BASE_DN)
 # Use a broad filter to get all objects, then filter in Python
 DEFAULT_SEARCH_FILTER = "(objectclass=*)"
-PAGE_SIZE = 1000  # Default page size for paged results control
+# Page size for the paged results control. Larger pages mean fewer round
+# trips, but some DCs misbehave above their MaxPageSize, so it can be
+# overridden with the SADUC_PAGE_SIZE environment variable.
+DEFAULT_PAGE_SIZE = 2000
+
+def _page_size_from_env():
+    """Reads SADUC_PAGE_SIZE, falling back to DEFAULT_PAGE_SIZE if it is invalid."""
+    value = os.environ.get('SADUC_PAGE_SIZE')
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Invalid SADUC_PAGE_SIZE '{value}', using {DEFAULT_PAGE_SIZE}.")
+        return DEFAULT_PAGE_SIZE
+
+PAGE_SIZE = _page_size_from_env()
 
 # A specific, curated list of classes for objects that can appear as
 # expandable branches in the left-hand tree view. This includes standard
 # containers as well as various special system containers.
-TREE_BRANCH_CLASSES = {
+TREE_BRANCH_CLASSES = frozenset({
     'organizationalUnit',
     'container',
     'builtinDomain',
@@ -57,33 +112,168 @@ TREE_BRANCH_CLASSES = {
     'dfsConfiguration',
     'classStore',
     'domainPolicy'          # For the "Default Domain Policy" object under System
-}
+})
+# The same classes as raw LDAP values, so entries can be checked undecoded
+TREE_BRANCH_CLASSES_BYTES = frozenset(oc.encode('utf-8') for oc in TREE_BRANCH_CLASSES)
+# Server-side filter matching only the objects that can be tree branches
+TREE_BRANCH_FILTER = '(|' + ''.join(f'(objectClass={oc})' for oc in sorted(TREE_BRANCH_CLASSES)) + ')'
+# Tree branches must have a name to display
+_TREE_NAME_FILTER = '(|(cn=*)(ou=*)(dc=*))'
+TREE_BRANCH_ADVANCED_FILTER = f'(&{TREE_BRANCH_FILTER}{_TREE_NAME_FILTER})'
+# The same, also excluding objects hidden outside the advanced view
+TREE_BRANCH_BASIC_FILTER = f'(&{TREE_BRANCH_FILTER}(!(showInAdvancedViewOnly=TRUE)){_TREE_NAME_FILTER})'
+
+def _tree_branch_filter(advanced_view):
+    """Returns the server-side filter for tree branches in the given view."""
+    return TREE_BRANCH_ADVANCED_FILTER if advanced_view else TREE_BRANCH_BASIC_FILTER
 
 # Specific container names that should not be expandable in the tree view.
 # This is a performance optimization for containers that *never* have sub-containers.
 # Stored in lowercase for robust, case-insensitive comparison.
-NON_EXPANDABLE_CONTAINERS = {
-    'cn=users,dc=home,dc=lucasit,dc=com',
-    'cn=computers,dc=home,dc=lucasit,dc=com',
-    'cn=builtin,dc=home,dc=lucasit,dc=com',
-    'cn=foreignsecurityprincipals,dc=home,dc=lucasit,dc=com'
-}
+NON_EXPANDABLE_CONTAINERS = frozenset(
+    f'{rdn},{BASE_DN}'.lower()
+    for rdn in ('cn=Users', 'cn=Computers', 'cn=Builtin', 'cn=ForeignSecurityPrincipals')
+)
+
+@functools.lru_cache(maxsize=4096)
+def _non_expandable(dn):
+    """Returns whether dn is one of NON_EXPANDABLE_CONTAINERS, ignoring case."""
+    return dn.lower() in NON_EXPANDABLE_CONTAINERS
 
 
+# Seconds a tree lookup result is reused before the directory is asked again
+TREE_CACHE_TTL = 60
+# (function name, dn lowercased, advanced_view) -> (load time, result)
+_tree_cache = {}
+
+def _tree_cache_get(kind, dn, advanced_view):
+    cached = _tree_cache.get((kind, dn.lower(), advanced_view))
+    if cached and time.monotonic() - cached[0] < TREE_CACHE_TTL:
+        return cached[1]
+    return None
+
+def _tree_cache_put(kind, dn, advanced_view, result):
+    _tree_cache[(kind, dn.lower(), advanced_view)] = (time.monotonic(), result)
+
+def invalidate_tree_cache(dn=None):
+    """
+    Forgets cached tree lookups for dn, its ancestors and its descendants,
+    or every cached lookup if dn is None.
+    """
+    if dn is None:
+        _tree_cache.clear()
+        return
+    dn = dn.lower()
+    for key in list(_tree_cache):
+        cached_dn = key[1]
+        if (cached_dn == dn or dn.endswith(',' + cached_dn)
+                or cached_dn.endswith(',' + dn)):
+            del _tree_cache[key]
+
+
+def obtain_kerberos_ticket(principal, password):
+    """
+    Obtains a Kerberos TGT for the principal and stores it in the default
+    credential cache. Raises KinitError on failure.
+    """
+    if krb5 is not None:
+        try:
+            ctx = krb5.init_context()
+            princ = krb5.parse_name_flags(ctx, principal.encode('utf-8'))
+            opt = krb5.get_init_creds_opt_alloc(ctx)
+            creds = krb5.get_init_creds_password(ctx, princ, opt, password=password.encode('utf-8'))
+            ccache = krb5.cc_default(ctx)
+            krb5.cc_initialize(ctx, ccache, princ)
+            krb5.cc_store_cred(ctx, ccache, creds)
+        except krb5.Krb5Error as e:
+            raise KinitError(str(e)) from e
+    elif gssapi is not None:
+        try:
+            name = gssapi.Name(principal, gssapi.NameType.kerberos_principal)
+            creds = gssapi.raw.acquire_cred_with_password(name, password.encode('utf-8'), usage='initiate').creds
+            gssapi.raw.store_cred(creds, usage='initiate', overwrite=True, set_default=True)
+        except gssapi.exceptions.GSSError as e:
+            raise KinitError(str(e)) from e
+    else:
+        try:
+            subprocess.run(['kinit', principal], input=password.encode('utf-8'),
+                           capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise KinitError(e.stderr.decode('utf-8').strip()) from e
+
+
+def _has_kerberos_ticket():
+    """
+    Checks the default credential cache for a valid ticket, in-process when
+    the gssapi bindings are available and with 'klist -s' otherwise.
+    """
+    if gssapi is not None:
+        try:
+            creds = gssapi.Credentials(usage='initiate')
+            return creds.lifetime is None or creds.lifetime > 0
+        except gssapi.exceptions.GSSError:
+            return False
+    result = subprocess.run(['klist', '-s'], capture_output=True, text=True)
+    return result.returncode == 0
+
+# Seconds to wait for a TCP connection to an LDAP server
+NETWORK_TIMEOUT = 3
+# Seconds to wait for the result of a synchronous LDAP operation
+OPERATION_TIMEOUT = 10
+# Seconds a server attempt runs before the next server is also tried
+CONNECT_HEAD_START = 0.1
+
+def _connect_to_server(server):
+    """
+    Connects and binds to one LDAP server.
+    Returns the connection, or None if it failed.
+    """
+    try:
+        logger.info(f"Attempting to connect to LDAP server: {server}")
+        # ReconnectLDAPObject remembers the bind, so a dropped connection
+        # can be re-established and re-bound in place.
+        conn = ldap.ldapobject.ReconnectLDAPObject(f'ldap://{server}')
+        conn.set_option(ldap.OPT_PROTOCOL_VERSION, 3)
+        conn.set_option(ldap.OPT_REFERRALS, 0)
+        # Use the SRV target name as given, rather than a reverse DNS lookup
+        # of its address, as the GSSAPI service principal
+        conn.set_option(ldap.OPT_X_SASL_NOCANON, 1)
+        conn.set_option(ldap.OPT_NETWORK_TIMEOUT, NETWORK_TIMEOUT)
+        conn.set_option(ldap.OPT_TIMEOUT, OPERATION_TIMEOUT)
+
+        # Kerberos/GSSAPI bind
+        sasl_auth = ldap.sasl.gssapi('')
+        conn.sasl_interactive_bind_s("", sasl_auth)
+        return conn
+    except ldap.LDAPError as e:
+        logger.warning(f"Failed to connect to {server}: {e}")
+        return None
+
+def _unbind_unused_connection(future):
+    """Closes a connection from a server attempt that lost the race."""
+    if future.cancelled():
+        return
+    conn = future.result()
+    if conn is not None:
+        try:
+            conn.unbind_s()
+        except ldap.LDAPError:
+            pass
+
 def get_ldap_conn():
     """
     Establishes an authenticated LDAP connection using GSSAPI/Kerberos.
     Includes a fallback mechanism for multiple servers discovered via DNS SRV records.
+    Returns (connection, server). Raises NoKerberosTicketError without a
+    ticket and LdapConnectionError if no server could be reached.
     """
     # Check for a valid Kerberos ticket before attempting connection
     logger.info("Checking for a valid Kerberos ticket...")
-    result = subprocess.run(['klist', '-s'], capture_output=True, text=True)
-    if result.returncode != 0:
+    if not _has_kerberos_ticket():
         raise NoKerberosTicketError(f"No valid Kerberos ticket found. Please run 'kinit' first.")
     logger.info("Kerberos ticket found.")
 
-    domain = '.'.join(p.split('=', 1)[-1] for p in BASE_DN.split(','))
-    srv_record = f'_ldap._tcp.{domain}'
+    srv_record = f'_ldap._tcp.{DOMAIN_NAME}'
 
     try:
         answers = dns.resolver.resolve(srv_record, 'SRV')
@@ -93,122 +283,249 @@ def get_ldap_conn():
         logger.info(f"Dynamically discovered LDAP servers via DNS: {server_list}")
     except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN) as e:
         logger.error(f"Failed to resolve DNS SRV record for '{srv_record}': {e}")
-        return None
+        raise LdapConnectionError(f"Could not find any LDAP servers for '{DOMAIN_NAME}' in DNS ({srv_record}).") from e
     except Exception as e:
         logger.error(f"An unexpected DNS error occurred: {e}")
-        return None
-
-    for server in server_list:
-        try:
-            logger.info(f"Attempting to connect to LDAP server: {server}")
-            conn = ldap.initialize(f'ldap://{server}')
-            conn.set_option(ldap.OPT_PROTOCOL_VERSION, 3)
-            conn.set_option(ldap.OPT_REFERRALS, 0)
-
-            # Kerberos/GSSAPI bind
-            sasl_auth = ldap.sasl.gssapi('')
-            conn.sasl_interactive_bind_s("", sasl_auth)
+        raise LdapConnectionError(f"DNS lookup of '{srv_record}' failed: {e}") from e
+
+    # Try the servers in order of preference. The next server is only
+    # started if the attempts so far have neither bound nor failed within
+    # CONNECT_HEAD_START, so a dead server does not hold up the rest and a
+    # quick preferred server is the only one bound to.
+    executor = ThreadPoolExecutor(max_workers=max(len(server_list), 1))
+    futures = {}
+    pending = set()
+    remaining = iter(server_list)
+    try:
+        while True:
+            server = next(remaining, None)
+            if server is not None:
+                future = executor.submit(_connect_to_server, server)
+                futures[future] = server
+                pending.add(future)
+                timeout = CONNECT_HEAD_START
+            elif pending:
+                timeout = None
+            else:
+                break
+            # A failed attempt returns early, so the next server starts at once
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            connected = [f for f in done if f.result() is not None]
+            if not connected:
+                continue
+            winner = connected[0]
+            server = futures[winner]
             logger.info(f"Samba backend: Successfully established LDAP connection to {server}.")
-            return conn, server
-        except ldap.LDAPError as e:
-            logger.warning(f"Failed to connect to {server}: {e}")
-            continue
+            # Close any other connection, now or once its attempt finishes
+            for other in futures:
+                if other is not winner:
+                    other.add_done_callback(_unbind_unused_connection)
+            return winner.result(), server
+    finally:
+        executor.shutdown(wait=False)
 
     logger.critical("Samba backend: Failed to connect to any LDAP servers.")
-    return None, None
+    raise LdapConnectionError(f"Could not connect to any of the LDAP servers: {', '.join(server_list)}")
 
-def get_paged_results(samba_conn, dn, scope, search_filter, attributes):
+# Attributes whose values are binary and must be kept as raw bytes
+BINARY_ATTRIBUTES = frozenset({'objectGUID', 'objectSid'})
+
+def _decode_entry(entry, binary_attrs=BINARY_ATTRIBUTES):
+    """Decodes an LDAP entry's values to str, leaving binary attributes as bytes."""
+    return {key: (values if key in binary_attrs else [v.decode('utf-8') for v in values])
+            for key, values in entry.items()}
+
+# Errors after which a search is worth retrying on a fresh connection
+_RECONNECT_ERRORS = (ldap.SERVER_DOWN, ldap.UNAVAILABLE)
+_PAGED_CONTROL_TYPE = SimplePagedResultsControl.controlType
+
+def iter_paged_results(samba_conn, dn, scope, search_filter, attributes):
     """
-    Performs a paged LDAP search to handle server-side result limits.
+    Performs a paged LDAP search to handle server-side result limits,
+    yielding (dn, attributes) results page by page as they arrive.
+    Referrals are skipped. If the server drops the connection before the
+    first page, the connection is re-established and the search retried once.
+    Any other LDAP error is raised to the caller, so a partial result is
+    never mistaken for a complete one.
     """
     page_ctrl = SimplePagedResultsControl(3, size=PAGE_SIZE, cookie='')
     search_ctrls = [page_ctrl]
-    all_results = []
+    first_page = True
 
     while True:
-        try:
-            msgid = samba_conn.search_ext(dn, scope, search_filter, attributes, serverctrls=search_ctrls)
-            rtype, rdata, rmsgid, serverctrls = samba_conn.result3(msgid)
-            all_results.extend(rdata)
-
-            pctrls = [c for c in serverctrls if c.controlType == SimplePagedResultsControl.controlType]
-            if not pctrls or not pctrls[0].cookie:
+        for attempt in range(2):
+            try:
+                msgid = samba_conn.search_ext(dn, scope, search_filter, attributes, serverctrls=search_ctrls)
+                rtype, rdata, rmsgid, serverctrls = samba_conn.result3(msgid)
                 break
+            except _RECONNECT_ERRORS as e:
+                # A page cookie is only valid on the connection that issued it,
+                # so only a search that has not returned anything can be retried.
+                if attempt or not first_page or not hasattr(samba_conn, 'reconnect'):
+                    raise
+                logger.warning(f"Connection lost during paged search, reconnecting: {e}")
+                samba_conn.reconnect(samba_conn._uri)
+        first_page = False
+
+        # Drop search references, which come back as (None, ['ldap://...']),
+        # so callers only ever see (dn, attribute dict) pairs.
+        yield from [result for result in rdata if result[0] is not None]
+
+        cookie = None
+        for control in serverctrls:
+            if control.controlType == _PAGED_CONTROL_TYPE:
+                cookie = control.cookie
+                break
+        if not cookie:
+            break
 
-            page_ctrl.cookie = pctrls[0].cookie
-
-        except ldap.LDAPError as e:
-            logger.error(f"Paged search error: {e}")
-            return all_results
+        page_ctrl.cookie = cookie
 
-    return all_results
+def get_paged_results(samba_conn, dn, scope, search_filter, attributes):
+    """
+    Performs a paged LDAP search to handle server-side result limits.
+    Raises ldap.LDAPError if the search fails.
+    """
+    return list(iter_paged_results(samba_conn, dn, scope, search_filter, attributes))
 
-def _is_tree_branch(entry, advanced_view=False):
+def _is_tree_branch(entry):
     """
     Helper to check if an LDAP object is a structural container for the tree view.
+    Whether it is visible in the current view is left to the search filter
+    from _tree_branch_filter().
     """
     if not isinstance(entry, dict) or not entry.get('objectClass'):
         return False
 
-    if not advanced_view:
-        show_in_adv_view = entry.get('showInAdvancedViewOnly')
-        if show_in_adv_view and show_in_adv_view[0].decode('utf-8').lower() == 'true':
-            return False
-
-    object_classes = {oc.decode('utf-8') for oc in entry['objectClass']}
-    
     # An object is a branch if its class is in our specific list.
-    return len(object_classes.intersection(TREE_BRANCH_CLASSES)) > 0
+    return any(oc in TREE_BRANCH_CLASSES_BYTES for oc in entry['objectClass'])
 
-def get_forest_root_info(samba_conn):
+# RootDSE attributes fetched together by get_root_dse()
+ROOT_DSE_ATTRIBUTES = [
+    'rootDomainNamingContext', 'configurationNamingContext', 'schemaNamingContext',
+    'defaultNamingContext', 'namingContexts'
+]
+
+def get_root_dse(samba_conn):
     """
-    Retrieves the forest root domain by querying the RootDSE.
+    Returns the decoded naming context attributes of the RootDSE. They are
+    fetched in one search on first use and kept on the connection.
+    Returns an empty dict if the RootDSE could not be read.
     """
-    logger.info("Querying RootDSE to find the forest root domain.")
+    root_dse = getattr(samba_conn, '_root_dse', None)
+    if root_dse is not None:
+        return root_dse
+
+    logger.info("Querying RootDSE for the naming contexts.")
     try:
         # A search with an empty base DN targets the RootDSE
-        res = samba_conn.search_s("", ldap.SCOPE_BASE, "(objectClass=*)", ['rootDomainNamingContext'])
-        if res and res[0][1].get('rootDomainNamingContext'):
-            attrs_dict = res[0][1]
-            root_dn = attrs_dict['rootDomainNamingContext'][0].decode('utf-8')
-            domain_name = ".".join(p.split('=')[1] for p in root_dn.split(',') if p.lower().startswith('dc='))
-            logger.info(f"Found forest root DN: {root_dn} (Name: {domain_name})")
-            return {'name': domain_name, 'dn': root_dn}
-        
-        logger.warning("RootDSE query successful but 'rootDomainNamingContext' attribute not found.")
-        return None
+        res = samba_conn.search_s("", ldap.SCOPE_BASE, "(objectClass=*)", ROOT_DSE_ATTRIBUTES)
     except ldap.LDAPError as e:
         logger.error(f"LDAP error querying RootDSE: {e}")
+        return {}
+    if not res:
+        return {}
+
+    root_dse = _decode_entry(res[0][1])
+    samba_conn._root_dse = root_dse
+    return root_dse
+
+def get_forest_root_info(samba_conn):
+    """
+    Retrieves the forest root domain from the RootDSE.
+    """
+    root_dn_values = get_root_dse(samba_conn).get('rootDomainNamingContext')
+    if root_dn_values:
+        root_dn = root_dn_values[0]
+        domain_name = dn_to_domain(root_dn)
+        logger.debug(f"Found forest root DN: {root_dn} (Name: {domain_name})")
+        return {'name': domain_name, 'dn': root_dn}
+
+    logger.warning("'rootDomainNamingContext' attribute not found in RootDSE.")
+    return None
+
+def _configuration_dn(samba_conn):
+    """
+    Returns the configurationNamingContext from the RootDSE, or None if it
+    could not be found.
+    """
+    config_dn_values = get_root_dse(samba_conn).get('configurationNamingContext')
+    if not config_dn_values:
+        logger.warning("Could not find 'configurationNamingContext' in RootDSE.")
         return None
+    return config_dn_values[0]
+
+def _probe_sub_containers(samba_conn, child_dns, advanced_view):
+    """
+    Checks which of child_dns have at least one tree branch below them.
+    The one-level, size-limited probes are all sent before any reply is
+    read, so they cost one round trip together rather than one each.
+    Returns a dict of DN -> True/False, or None where the probe failed.
+    """
+    search_filter = _tree_branch_filter(advanced_view)
+    msgids = {}
+    for child_dn in child_dns:
+        try:
+            msgids[child_dn] = samba_conn.search_ext(child_dn, ldap.SCOPE_ONELEVEL, search_filter,
+                                                     ['objectClass'], sizelimit=1)
+        except ldap.LDAPError as e:
+            logger.error(f"LDAP error checking for expandable children in '{child_dn}': {e}")
+
+    found = dict.fromkeys(child_dns)
+    for child_dn, msgid in msgids.items():
+        try:
+            rtype, rdata, rmsgid, serverctrls = samba_conn.result3(msgid)
+            found[child_dn] = any(_is_tree_branch(entry) for entry_dn, entry in rdata)
+        except ldap.SIZELIMIT_EXCEEDED:
+            # More than one child matched the branch filter
+            found[child_dn] = True
+        except ldap.NO_SUCH_OBJECT:
+            found[child_dn] = False
+        except ldap.LDAPError as e:
+            logger.error(f"LDAP error checking for expandable children in '{child_dn}': {e}")
+        if found[child_dn] is not None:
+            _tree_cache_put('has_children', child_dn, advanced_view, found[child_dn])
+    return found
 
 def get_expandable_children(samba_conn, dn, advanced_view=False):
     """
     Retrieves children of a given DN that should appear as branches in the tree view.
     """
+    cached = _tree_cache_get('children', dn, advanced_view)
+    if cached is not None:
+        return cached
+
     logger.debug(f"Fetching expandable children for DN: {dn}")
     try:
         # Request RDN attributes. We specifically AVOID displayName for the tree view.
-        attributes = ['cn', 'ou', 'dc', 'distinguishedName', 'objectClass', 'showInAdvancedViewOnly']
-        res = get_paged_results(samba_conn, dn, ldap.SCOPE_ONELEVEL, DEFAULT_SEARCH_FILTER, attributes)
+        attributes = ['cn', 'ou', 'dc', 'objectClass']
+        res = get_paged_results(samba_conn, dn, ldap.SCOPE_ONELEVEL, _tree_branch_filter(advanced_view), attributes)
 
-        children = []
+        branches = []
         for child_dn, entry in res:
-            if not isinstance(entry, dict):
-                logger.debug(f"Skipping non-dict entry for DN='{child_dn}': {entry}")
-                continue
-            
             # Use the correct RDN attribute for the name ('ou', 'dc', or 'cn')
             name_attr = entry.get('ou') or entry.get('dc') or entry.get('cn')
 
             # Use our stricter check to see if this object belongs in the tree
-            if _is_tree_branch(entry, advanced_view) and name_attr:
-                has_sub_containers = has_expandable_children(samba_conn, child_dn, advanced_view)
-                children.append({
-                    'name': name_attr[0].decode('utf-8'),
-                    'dn': child_dn,
-                    'objectClass': [oc.decode('utf-8') for oc in entry.get('objectClass', [])],
-                    'has_sub_containers': has_sub_containers
-                })
+            if _is_tree_branch(entry) and name_attr:
+                branches.append((child_dn, entry, name_attr))
+
+        to_probe = [child_dn for child_dn, entry, name_attr in branches
+                    if advanced_view or not _non_expandable(child_dn)]
+        sub_containers = _probe_sub_containers(samba_conn, to_probe, advanced_view)
+
+        children = []
+        for child_dn, entry, name_attr in branches:
+            children.append({
+                'name': name_attr[0].decode('utf-8'),
+                'dn': child_dn,
+                'objectClass': [oc.decode('utf-8') for oc in entry.get('objectClass', [])],
+                # None (probe failed) leaves the tree model to check again later
+                'has_sub_containers': sub_containers.get(child_dn, False)
+            })
+        # A failed probe makes the result incomplete, so only cache a full one
+        if None not in sub_containers.values():
+            _tree_cache_put('children', dn, advanced_view, children)
         return children
     except ldap.NO_SUCH_OBJECT:
         logger.warning(f"DN '{dn}' does not exist.")
@@ -224,21 +541,26 @@ def has_expandable_children(samba_conn, dn, advanced_view=False):
     """
     logger.debug(f"Checking for expandable children in DN: {dn}")
 
-    if not advanced_view and dn.lower() in NON_EXPANDABLE_CONTAINERS:
+    if not advanced_view and _non_expandable(dn):
         return False
 
-    try:
-        attributes = ['cn', 'ou', 'dc', 'objectClass', 'showInAdvancedViewOnly']
-        res = samba_conn.search_s(dn, ldap.SCOPE_ONELEVEL, DEFAULT_SEARCH_FILTER, attributes)
+    cached = _tree_cache_get('has_children', dn, advanced_view)
+    if cached is not None:
+        return cached
 
-        if not res:
-            return False
-
-        for child_dn, entry in res:
+    try:
+        # One matching child is enough, so let the server stop after the first.
+        attributes = ['objectClass']
+        try:
+            res = samba_conn.search_ext_s(dn, ldap.SCOPE_ONELEVEL, _tree_branch_filter(advanced_view),
+                                          attributes, sizelimit=1)
             # Use the same strict check here
-            if _is_tree_branch(entry, advanced_view):
-                return True # Found at least one valid branch child
-        return False
+            result = any(_is_tree_branch(entry) for child_dn, entry in res)
+        except ldap.SIZELIMIT_EXCEEDED:
+            # More than one child matched the branch filter
+            result = True
+        _tree_cache_put('has_children', dn, advanced_view, result)
+        return result
     except ldap.NO_SUCH_OBJECT:
         return False
     except ldap.LDAPError as e:
@@ -253,27 +575,32 @@ def get_all_objects_in_dn(samba_conn, dn):
     logger.debug(f"Fetching all objects in DN: {dn}")
     try:
         search_filter = "(objectclass=*)"
-        attributes = ['cn', 'ou', 'dc', 'displayName', 'description', 'distinguishedName', 'objectClass', 'sAMAccountName', 'userAccountControl']
+        # Only what the list view shows; the DN comes with every result and
+        # the properties dialogs fetch the rest when opened.
+        attributes = ['cn', 'ou', 'dc', 'displayName', 'description', 'objectClass', 'userAccountControl']
 
-        res = get_paged_results(samba_conn, dn, ldap.SCOPE_ONELEVEL, search_filter, attributes)
+        res = iter_paged_results(samba_conn, dn, ldap.SCOPE_ONELEVEL, search_filter, attributes)
 
         objects = []
+        append = objects.append
         for child_dn, entry in res:
-            if isinstance(entry, dict):
-                # Prioritize displayName for the list view
-                name_attr = entry.get('displayName') or entry.get('ou') or entry.get('dc') or entry.get('cn')
-                if name_attr:
-                    obj_data = {
-                        'name': name_attr[0].decode('utf-8'),
-                        'dn': child_dn,
-                        'objectClass': [oc.decode('utf-8') for oc in entry.get('objectClass', [])]
-                    }
-                    # Add description if it exists
-                    if 'description' in entry:
-                        obj_data['description'] = entry['description'][0].decode('utf-8')
-                    if 'userAccountControl' in entry:
-                        obj_data['userAccountControl'] = entry['userAccountControl'][0].decode('utf-8')
-                    objects.append(obj_data)
+            get = entry.get
+            # Prioritize displayName for the list view
+            name_attr = get('displayName') or get('ou') or get('dc') or get('cn')
+            if name_attr:
+                obj_data = {
+                    'name': name_attr[0].decode('utf-8'),
+                    'dn': child_dn,
+                    'objectClass': [oc.decode('utf-8') for oc in get('objectClass', ())]
+                }
+                # Add description if it exists
+                description = get('description')
+                if description:
+                    obj_data['description'] = description[0].decode('utf-8')
+                uac = get('userAccountControl')
+                if uac:
+                    obj_data['userAccountControl'] = uac[0].decode('utf-8')
+                append(obj_data)
 
         return objects
     except ldap.NO_SUCH_OBJECT:
@@ -284,18 +611,45 @@ def get_all_objects_in_dn(samba_conn, dn):
         return []
 
 
+def _new_user_list_entry(user_data):
+    """
+    Builds the list view entry for a newly created user, in the same shape
+    as the entries returned by get_all_objects_in_dn().
+    """
+    uac = 0x0200  # NORMAL_ACCOUNT
+    if user_data.get('account_is_disabled'):
+        uac |= 0x0002
+    if user_data.get('password_never_expires'):
+        uac |= 0x10000
+    name = user_data.get('full_name', '')
+    return {
+        'name': name,
+        'dn': f"CN={ldap.dn.escape_dn_chars(name)},{user_data.get('container_dn')}",
+        'objectClass': ['top', 'person', 'organizationalPerson', 'user'],
+        'userAccountControl': str(uac)
+    }
+
+
 def create_user_samba(samba_conn, user_data):
-    """Placeholder for Samba user creation logic."""
+    """
+    Placeholder for Samba user creation logic. Returns (success, message_key,
+    list entry for the new user).
+    """
     logger.info(f"Samba backend: Creating user with data: {user_data}")
     # ... placeholder for backend logic ...
-    return True, "samba_backend.success.create_user"
+    invalidate_tree_cache(user_data.get('container_dn'))
+    return True, "samba_backend.success.create_user", _new_user_list_entry(user_data)
 
 
 def copy_user_samba(samba_conn, source_username, new_user_data):
-    """Placeholder for Samba user creation logic."""
+    """
+    Placeholder for Samba user copy logic. Returns (success, message_key,
+    list entry for the new user).
+    """
     logger.info(f"Samba backend: Copying user '{source_username}' to new user with data: {new_user_data}")
     # ... placeholder for backend logic ...
-    return True, "samba_backend.success.copy_user"
+    invalidate_tree_cache(new_user_data.get('container_dn'))
+    return True, "samba_backend.success.copy_user", _new_user_list_entry(new_user_data)
 
 def get_user_properties(samba_conn, user_dn):
     """Retrieves all properties for a given user."""
@@ -316,12 +670,7 @@ def get_user_properties(samba_conn, user_dn):
         if not res:
             return None
 
-        entry = res[0][1]
-        properties = {}
-        for key, value in entry.items():
-            properties[key] = [v.decode('utf-8') for v in value]
-
-        return properties
+        return _decode_entry(res[0][1])
 
     except ldap.LDAPError as e:
         logger.error(f"LDAP error fetching user properties for DN '{user_dn}': {e}")
@@ -342,12 +691,7 @@ def get_computer_properties(samba_conn, computer_dn):
         if not res:
             return None
 
-        entry = res[0][1]
-        properties = {}
-        for key, value in entry.items():
-            properties[key] = [v.decode('utf-8') for v in value]
-
-        return properties
+        return _decode_entry(res[0][1])
 
     except ldap.LDAPError as e:
         logger.error(f"LDAP error fetching computer properties for DN '{computer_dn}': {e}")
@@ -366,12 +710,7 @@ def get_group_properties(samba_conn, group_dn, attributes=None):
         if not res:
             return None
 
-        entry = res[0][1]
-        properties = {}
-        for key, value in entry.items():
-            properties[key] = [v.decode('utf-8') for v in value]
-
-        return properties
+        return _decode_entry(res[0][1])
 
     except ldap.LDAPError as e:
         logger.error(f"LDAP error fetching group properties for DN '{group_dn}': {e}")
@@ -395,159 +734,170 @@ def get_container_properties(samba_conn, container_dn, attributes=None):
             logger.warning(f"No container object found at DN: {container_dn}")
             return None
 
-        entry = res[0][1]
-        properties = {}
-        for key, value in entry.items():
-            properties[key] = [v.decode('utf-8') for v in value]
-
-        return properties
+        return _decode_entry(res[0][1])
 
     except ldap.LDAPError as e:
         logger.error(f"LDAP error fetching container properties for DN '{container_dn}': {e}")
         return None
 
 
-def get_group_by_rid(samba_conn, rid):
-    """Finds a group by its primaryGroupToken (RID)."""
-    logger.debug(f"Searching for group with RID: {rid}")
-    
-    root_info = get_forest_root_info(samba_conn)
-    search_base = root_info['dn'] if root_info else BASE_DN
-
-    # Convert RID to string if it's not already
-    rid_str = str(rid)
-    
-    search_filter = f"(&(objectClass=group)(primaryGroupToken={rid_str}))"
-    logger.debug(f"Using search filter: {search_filter}")
-    logger.debug(f"Searching in base DN: {search_base}")
-    
-    try:
-        # Use paged results for better reliability
-        res = get_paged_results(samba_conn, search_base, ldap.SCOPE_SUBTREE, search_filter, ['cn', 'displayName'])
-        
-        logger.debug(f"Search returned {len(res)} results")
-        
-        for dn, attrs_data in res:
-            # Handle referrals, which can appear as (None, ['ldap://...'])
-            if dn is None:
-                logger.debug(f"Ignoring referral result while searching for group with RID {rid}: {attrs_data}")
+# Names of the well-known groups, used as a last resort when a group cannot
+# be found by its RID
+WELL_KNOWN_GROUP_NAMES = {
+    '513': 'Domain Users',
+    '515': 'Domain Computers',
+    '516': 'Domain Controllers',
+    '517': 'Cert Publishers',
+    '518': 'Schema Admins',
+    '519': 'Enterprise Admins',
+    '520': 'Group Policy Creator Owners',
+    '521': 'Read-only Domain Controllers',
+    '522': 'Cloneable Domain Controllers'
+}
+
+def _decode_value(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+def _group_results(res):
+    """
+    Yields (dn, attrs, info) for each usable result of a group search, where
+    info is the {'dn', 'cn', 'displayName'} dict returned to callers.
+    """
+    logger.debug(f"Search returned {len(res)} results")
+
+    for dn, attrs_data in res:
+        # Handle different response formats from ldap library
+        attrs = attrs_data
+        if isinstance(attrs_data, list):
+            try:
+                attrs = dict(attrs_data)
+            except (TypeError, ValueError):
+                logger.error(f"Could not convert attribute list to dict for DN '{dn}'. List was: {attrs_data}")
                 continue
 
-            logger.debug(f"Processing result: DN='{dn}', attrs={attrs_data}")
+        cn_values = attrs.get('cn')
+        if not cn_values:
+            logger.warning(f"Group found at DN '{dn}' but has no 'cn' attribute.")
+            continue
 
-            # Handle different response formats from ldap library
-            attrs = attrs_data
-            if isinstance(attrs_data, list):
-                try:
-                    attrs = dict(attrs_data)
-                except (TypeError, ValueError):
-                    logger.error(f"Could not convert attribute list to dict for DN '{dn}'. List was: {attrs_data}")
-                    continue
+        cn = _decode_value(cn_values[0])
+        displayName_values = attrs.get('displayName')
+        displayName = _decode_value(displayName_values[0]) if displayName_values else cn
+        yield dn, attrs, {
+            'dn': dn,
+            'cn': cn,
+            'displayName': displayName
+        }
 
-            cn_values = attrs.get('cn')
-            if not cn_values:
-                logger.warning(f"Group with RID {rid} found at DN '{dn}' but has no 'cn' attribute.")
-                continue
-                
-            cn = cn_values[0].decode('utf-8') if isinstance(cn_values[0], bytes) else cn_values[0]
-            
-            # Handle displayName
-            displayName_values = attrs.get('displayName')
-            if displayName_values:
-                displayName = displayName_values[0].decode('utf-8') if isinstance(displayName_values[0], bytes) else displayName_values[0]
-            else:
-                displayName = cn
-            
-            logger.info(f"Found group with RID {rid}: DN='{dn}', cn='{cn}', displayName='{displayName}'")
-            return {
-                'dn': dn,
-                'cn': cn,
-                'displayName': displayName
-            }
-        
-        # If we get here, no group was found
-        logger.warning(f"No group found with RID {rid}")
-        
-        # Try alternative search - some systems use 'rid' instead of 'primaryGroupToken'
-        alt_filter = f"(&(objectClass=group)(rid={rid_str}))"
-        logger.debug(f"Trying alternative search with filter: {alt_filter}")
-        
-        alt_res = get_paged_results(samba_conn, search_base, ldap.SCOPE_SUBTREE, alt_filter, ['cn', 'displayName'])
-        logger.debug(f"Alternative search returned {len(alt_res)} results")
-        
-        if alt_res:
-            for dn, attrs_data in alt_res:
-                if dn is None:
-                    continue
-                    
-                attrs = attrs_data
-                if isinstance(attrs_data, list):
-                    try:
-                        attrs = dict(attrs_data)
-                    except (TypeError, ValueError):
-                        continue
-
-                cn_values = attrs.get('cn')
-                if cn_values:
-                    cn = cn_values[0].decode('utf-8') if isinstance(cn_values[0], bytes) else cn_values[0]
-                    
-                    displayName_values = attrs.get('displayName')
-                    if displayName_values:
-                        displayName = displayName_values[0].decode('utf-8') if isinstance(displayName_values[0], bytes) else displayName_values[0]
-                    else:
-                        displayName = cn
-                    
-                    logger.info(f"Found group with RID {rid} using alternative search: DN='{dn}', cn='{cn}', displayName='{displayName}'")
-                    return {
-                        'dn': dn,
-                        'cn': cn,
-                        'displayName': displayName
-                    }
-        
-        # If still no results, try searching for well-known groups
-        if rid_str in ['513', '515', '516', '517', '518', '519', '520', '521', '522']:
-            well_known_groups = {
-                '513': 'Domain Users',
-                '515': 'Domain Computers', 
-                '516': 'Domain Controllers',
-                '517': 'Cert Publishers',
-                '518': 'Schema Admins',
-                '519': 'Enterprise Admins',
-                '520': 'Group Policy Creator Owners',
-                '521': 'Read-only Domain Controllers',
-                '522': 'Cloneable Domain Controllers'
-            }
-            
-            group_name = well_known_groups.get(rid_str)
-            if group_name:
-                logger.info(f"Trying to find well-known group '{group_name}' for RID {rid}")
-                name_filter = f"(&(objectClass=group)(cn={group_name}))"
-                name_res = get_paged_results(samba_conn, search_base, ldap.SCOPE_SUBTREE, name_filter, ['cn', 'displayName', 'primaryGroupToken'])
-                
-                for dn, attrs_data in name_res:
-                    if dn is None:
-                        continue
-                    
-                    attrs = attrs_data if isinstance(attrs_data, dict) else dict(attrs_data)
-                    cn_values = attrs.get('cn')
-                    
-                    if cn_values:
-                        cn = cn_values[0].decode('utf-8') if isinstance(cn_values[0], bytes) else cn_values[0]
-                        displayName_values = attrs.get('displayName')
-                        displayName = displayName_values[0].decode('utf-8') if displayName_values and isinstance(displayName_values[0], bytes) else cn
-                        
-                        logger.info(f"Found well-known group: DN='{dn}', cn='{cn}', displayName='{displayName}'")
-                        return {
-                            'dn': dn,
-                            'cn': cn,
-                            'displayName': displayName
-                        }
-        
-        return None
-        
+def _group_rid_query(wanted, fallback):
+    """
+    Builds the search for the RIDs in wanted. Returns (filter, attributes,
+    fallback_names), where fallback_names maps a lowercased well-known group
+    name to the RID it may stand in for.
+    """
+    attributes = ['cn', 'displayName', 'primaryGroupToken']
+    clauses = [f"(primaryGroupToken={rid})" for rid in sorted(wanted)]
+    fallback_names = {}
+    if fallback:
+        # Some systems use 'rid' instead of 'primaryGroupToken'
+        attributes.append('rid')
+        clauses += [f"(rid={rid})" for rid in sorted(wanted)]
+        fallback_names = {WELL_KNOWN_GROUP_NAMES[rid].lower(): rid
+                          for rid in wanted if rid in WELL_KNOWN_GROUP_NAMES}
+        clauses += [f"(cn={WELL_KNOWN_GROUP_NAMES[rid]})" for rid in sorted(fallback_names.values())]
+    search_filter = "(&(objectClass=group)(|" + "".join(clauses) + "))"
+    return search_filter, attributes, fallback_names
+
+def _match_group_rids(res, wanted, fallback_names, matches):
+    """
+    Records the groups in res that match a RID in wanted into matches, a dict
+    of RID -> (match rank, group info) where a lower rank is a better match.
+    """
+    for dn, attrs, info in _group_results(res):
+        candidates = []
+        for rank, attr in enumerate(('primaryGroupToken', 'rid')):
+            values = attrs.get(attr)
+            if values:
+                candidates.append((rank, _decode_value(values[0])))
+        if info['cn'].lower() in fallback_names:
+            candidates.append((2, fallback_names[info['cn'].lower()]))
+
+        for rank, rid in candidates:
+            if rid in wanted and (rid not in matches or rank < matches[rid][0]):
+                matches[rid] = (rank, info)
+
+def _pipelined_search(samba_conn, bases, scope, search_filter, attributes):
+    """
+    Sends the same search to several bases before waiting for any reply, so
+    the round trips overlap on the one connection. Returns the combined
+    results; a base that fails is logged and skipped.
+    """
+    msgids = []
+    for base in bases:
+        try:
+            msgids.append((base, samba_conn.search_ext(base, scope, search_filter, attributes)))
+        except ldap.LDAPError as e:
+            logger.error(f"LDAP error searching '{base}': {e}")
+
+    results = []
+    for base, msgid in msgids:
+        try:
+            rtype, rdata, rmsgid, serverctrls = samba_conn.result3(msgid)
+        except ldap.LDAPError as e:
+            logger.error(f"LDAP error searching '{base}': {e}")
+            continue
+        results.extend(result for result in rdata if result[0] is not None)
+    return results
+
+def get_groups_by_rids(samba_conn, rids, fallback=False, search_base=None):
+    """
+    Finds the groups for several primaryGroupToken values (RIDs). Returns a
+    dict of RID string -> {'dn', 'cn', 'displayName'}; RIDs with no matching
+    group are left out.
+
+    Without a search_base, the CN=Users and CN=Builtin containers of the
+    domain are searched first, together, since that is where primary groups
+    normally live, and only RIDs not found there are searched for below the
+    forest root. With a search_base, only its subtree is searched.
+
+    With fallback=True each search also matches groups by their 'rid'
+    attribute and, for well-known RIDs, by group name; these matches are only
+    used for RIDs that no primaryGroupToken matched.
+    """
+    wanted = {str(rid) for rid in rids}
+    if not wanted:
+        return {}
+    logger.debug(f"Searching for groups with RIDs: {sorted(wanted)}")
+
+    matches = {}
+    try:
+        if search_base is None:
+            domain_dn = get_root_dse(samba_conn).get('defaultNamingContext', [BASE_DN])[0]
+            search_filter, attributes, fallback_names = _group_rid_query(wanted, fallback)
+            logger.debug(f"Using search filter: {search_filter} in the Users and Builtin containers")
+            res = _pipelined_search(samba_conn, [f"CN=Users,{domain_dn}", f"CN=Builtin,{domain_dn}"],
+                                    ldap.SCOPE_ONELEVEL, search_filter, attributes)
+            _match_group_rids(res, wanted, fallback_names, matches)
+
+            root_info = get_forest_root_info(samba_conn)
+            search_base = root_info['dn'] if root_info else BASE_DN
+
+        missing = wanted - matches.keys()
+        if missing:
+            search_filter, attributes, fallback_names = _group_rid_query(missing, fallback)
+            logger.debug(f"Using search filter: {search_filter} in base DN: {search_base}")
+            res = get_paged_results(samba_conn, search_base, ldap.SCOPE_SUBTREE, search_filter, attributes)
+            _match_group_rids(res, missing, fallback_names, matches)
     except ldap.LDAPError as e:
-        logger.error(f"LDAP error searching for group with RID {rid}: {e}")
-        return None
+        logger.error(f"LDAP error searching for groups with RIDs {sorted(wanted)}: {e}")
+
+    for rid in sorted(wanted - matches.keys()):
+        logger.warning(f"No group found with RID {rid}")
+    return {rid: info for rid, (rank, info) in matches.items()}
+
+def get_group_by_rid(samba_conn, rid, fallback=True, search_base=None):
+    """Finds a group by its primaryGroupToken (RID)."""
+    return get_groups_by_rids(samba_conn, [rid], fallback=fallback, search_base=search_base).get(str(rid))
 
 def get_upn_suffixes(samba_conn):
     """
@@ -556,12 +906,10 @@ def get_upn_suffixes(samba_conn):
     logger.info("Querying for UPN suffixes.")
     try:
         # First, find the configuration naming context from the RootDSE
-        root_dse = samba_conn.search_s("", ldap.SCOPE_BASE, "(objectClass=*)", ['configurationNamingContext'])
-        if not root_dse or 'configurationNamingContext' not in root_dse[0][1]:
-            logger.warning("Could not find 'configurationNamingContext' in RootDSE.")
+        config_dn = _configuration_dn(samba_conn)
+        if config_dn is None:
             return []
 
-        config_dn = root_dse[0][1]['configurationNamingContext'][0].decode('utf-8')
         partitions_dn = f"CN=Partitions,{config_dn}"
 
         # Now query the partitions container for the upnSuffixes attribute
@@ -586,6 +934,7 @@ def update_object_attributes(samba_conn, dn, modifications):
     logger.info(f"Attempting to modify DN: {dn} with changes: {modifications}")
     try:
         samba_conn.modify_s(dn, modifications)
+        invalidate_tree_cache(dn)
         logger.info(f"Successfully modified DN: {dn}")
         return True, "Object updated successfully."
     except ldap.LDAPError as e:
@@ -604,15 +953,7 @@ def get_ntds_settings(samba_conn, ntds_dn):
         if not res:
             return None
 
-        entry = res[0][1]
-        properties = {}
-        for key, value in entry.items():
-            if key == 'objectGUID':
-                properties[key] = value # Keep it as raw bytes
-            else:
-                properties[key] = [v.decode('utf-8') for v in value]
-
-        return properties
+        return _decode_entry(res[0][1])
 
     except ldap.LDAPError as e:
         logger.error(f"LDAP error fetching NTDS settings for DN '{ntds_dn}': {e}")
@@ -629,12 +970,10 @@ def get_query_policies(samba_conn):
     logger.info("Querying for LDAP query policies.")
     try:
         # First, find the configuration naming context from the RootDSE
-        root_dse = samba_conn.search_s("", ldap.SCOPE_BASE, "(objectClass=*)", ['configurationNamingContext'])
-        if not root_dse or 'configurationNamingContext' not in root_dse[0][1]:
-            logger.warning("Could not find 'configurationNamingContext' in RootDSE.")
+        config_dn = _configuration_dn(samba_conn)
+        if config_dn is None:
             return ["Default Query Policy"]
 
-        config_dn = root_dse[0][1]['configurationNamingContext'][0].decode('utf-8')
         search_base = f"CN=Query-Policies,CN=Directory Service,CN=Windows NT,CN=Services,{config_dn}"
 
         res = get_paged_results(samba_conn, search_base, ldap.SCOPE_ONELEVEL, '(objectClass=queryPolicy)', ['cn'])
@@ -662,9 +1001,17 @@ def get_replication_connections(samba_conn, ntds_dn):
     # 'repsFrom' and 'repsTo' attributes.
     return [], [] # from, to
 
-def find_objects(samba_conn, search_base, object_type, name, description):
+# Attributes a name is matched against by a prefix search in find_objects()
+PREFIX_NAME_ATTRIBUTES = ('cn', 'sAMAccountName', 'displayName', 'givenName', 'sn')
+
+def find_objects(samba_conn, search_base, object_type, name, description, substring=True):
     """
     Finds objects in the directory based on criteria.
+
+    With substring=True the name and description match anywhere in the value.
+    With substring=False they only match at the start, which the server can
+    answer from its indexes instead of scanning every object, and a name is
+    also matched against the account and personal name attributes.
     """
     logger.info(f"Finding objects in {search_base} of type {object_type} with name: {name} and description: {description}")
 
@@ -684,13 +1031,15 @@ def find_objects(samba_conn, search_base, object_type, name, description):
     name_filter = ""
     if name:
         if object_type == "Organizational Units":
-            name_filter = f"(ou=*{name}*)"
-        else:
+            name_filter = f"(ou=*{name}*)" if substring else f"(ou={name}*)"
+        elif substring:
             name_filter = f"(|(cn=*{name}*)(name=*{name}*))"
+        else:
+            name_filter = "(|" + "".join(f"({attr}={name}*)" for attr in PREFIX_NAME_ATTRIBUTES) + ")"
 
     description_filter = ""
     if description:
-        description_filter = f"(description=*{description}*)"
+        description_filter = f"(description=*{description}*)" if substring else f"(description={description}*)"
 
     if name_filter and description_filter:
         attribute_filter = f"(&{name_filter}{description_filter})"
@@ -711,22 +1060,24 @@ def find_objects(samba_conn, search_base, object_type, name, description):
 
     # --- Perform Search ---
     try:
-        attributes = ['cn', 'ou', 'dc', 'displayName', 'description', 'distinguishedName', 'objectClass']
-        res = get_paged_results(samba_conn, search_base, ldap.SCOPE_SUBTREE, search_filter, attributes)
+        attributes = ['cn', 'ou', 'displayName', 'description', 'objectClass']
+        res = iter_paged_results(samba_conn, search_base, ldap.SCOPE_SUBTREE, search_filter, attributes)
 
         objects = []
+        append = objects.append
         for child_dn, entry in res:
-            if isinstance(entry, dict):
-                name_attr = entry.get('displayName') or entry.get('ou') or entry.get('cn')
-                if name_attr:
-                    obj_data = {
-                        'name': name_attr[0].decode('utf-8'),
-                        'dn': child_dn,
-                        'objectClass': [oc.decode('utf-8') for oc in entry.get('objectClass', [])]
-                    }
-                    if 'description' in entry:
-                        obj_data['description'] = entry['description'][0].decode('utf-8')
-                    objects.append(obj_data)
+            get = entry.get
+            name_attr = get('displayName') or get('ou') or get('cn')
+            if name_attr:
+                obj_data = {
+                    'name': name_attr[0].decode('utf-8'),
+                    'dn': child_dn,
+                    'objectClass': [oc.decode('utf-8') for oc in get('objectClass', ())]
+                }
+                description = get('description')
+                if description:
+                    obj_data['description'] = description[0].decode('utf-8')
+                append(obj_data)
         return objects
     except ldap.LDAPError as e:
         logger.error(f"LDAP error during find operation: {e}")
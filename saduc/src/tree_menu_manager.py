@@ -1,11 +1,121 @@
 from PyQt5.QtWidgets import QMenu, QAction
+from PyQt5.QtGui import QFont
 from functools import partial
 import main_window_actions as actions
+from ad_tree_model import DN_ROLE
+
+# i18n keys of every label the tree context menus use
+MENU_LABEL_KEYS = (
+    "context_menu.properties",
+    "context_menu.new_query",
+    "context_menu.view_add_remove_columns",
+    "context_menu.view_large_icons",
+    "context_menu.view_small_icons",
+    "context_menu.view_list",
+    "context_menu.view_detail",
+    "context_menu.view_filter_options",
+    "context_menu.view_customize",
+    "context_menu.change_domain",
+    "action_pane.menu.change_dc",
+    "context_menu.all_tasks",
+    "context_menu.view",
+    "context_menu.refresh",
+    "context_menu.export_list",
+    "context_menu.import_query",
+    "context_menu.new",
+    "context_menu.delegate_control",
+    "action_pane.menu.find_user",
+    "context_menu.raise_domain_level",
+    "context_menu.operations_masters",
+    "context_menu.move",
+    "context_menu.cut",
+    "context_menu.delete",
+    "context_menu.rename",
+    "action_pane.menu.new_computer",
+    "context_menu.new_contact",
+    "action_pane.menu.new_group",
+    "context_menu.new_inetorgperson",
+    "context_menu.new_msds_keycredential",
+    "context_menu.new_msds_resourcepropertylist",
+    "context_menu.new_msds_shadowprincipalcontainer",
+    "context_menu.new_msimaging_psps",
+    "context_menu.new_msmq_queue_alias",
+    "context_menu.new_ou",
+    "context_menu.new_printer",
+    "action_pane.menu.new_user",
+    "context_menu.new_shared_folder",
+)
+
+# Handlers the tree context menus connect to, keyed by the names the menu
+# builders use. Each is bound to the main window once, in __init__.
+MENU_HANDLERS = {
+    'container_properties': actions.on_container_properties_action_triggered,
+    'new_query': actions.on_new_query_action_triggered,
+    'view_add_remove_columns': actions.on_view_add_remove_columns_action_triggered,
+    'view_large_icons': actions.on_view_large_icons_action_triggered,
+    'view_small_icons': actions.on_view_small_icons_action_triggered,
+    'view_list': actions.on_view_list_action_triggered,
+    'view_detail': actions.on_view_detail_action_triggered,
+    'view_filter_options': actions.on_view_filter_options_action_triggered,
+    'view_customize': actions.on_view_customize_action_triggered,
+    'change_domain': actions.on_change_domain_action_triggered,
+    'change_dc': actions.on_change_dc_action_triggered,
+    'refresh': actions.on_refresh_action_triggered,
+    'export_list': actions.on_export_list_action_triggered,
+    'import_query_definition': actions.on_import_query_definition_action_triggered,
+    'delegate_control': actions.on_delegate_control_action_triggered,
+    'find_user': actions.on_find_in_current_container_action_triggered,
+    'raise_domain_functional_level': actions.on_raise_domain_functional_level_action_triggered,
+    'operations_masters': actions.on_operations_masters_action_triggered,
+    'move': actions.on_move_action_triggered,
+    'stub': actions.on_stub_action_triggered,
+    'delete_container': actions.on_delete_container_action_triggered,
+    'rename': actions.on_rename_action_triggered,
+    'new_computer': actions.on_new_computer_action_triggered,
+    'new_contact': actions.on_new_contact_action_triggered,
+    'new_group': actions.on_new_group_action_triggered,
+    'new_inetorgperson': actions.on_new_inetorgperson_action_triggered,
+    'new_msds_keycredential': actions.on_new_msds_keycredential_action_triggered,
+    'new_msds_resourcepropertylist': actions.on_new_msds_resourcepropertylist_action_triggered,
+    'new_msds_shadowprincipalcontainer': actions.on_new_msds_shadowprincipalcontainer_action_triggered,
+    'new_msimaging_psps': actions.on_new_msimaging_psps_action_triggered,
+    'new_msmq_queue_alias': actions.on_new_msmq_queue_alias_action_triggered,
+    'new_ou': actions.on_new_ou_action_triggered,
+    'new_printer': actions.on_new_printer_action_triggered,
+    'new_user': actions.on_new_user_action_triggered,
+    'new_shared_folder': actions.on_new_shared_folder_action_triggered,
+}
 
 class TreeMenuManager:
     def __init__(self, main_window):
         self.main_window = main_window
         self.i18n = main_window.i18n
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        self._cb = {name: partial(handler, main_window) for name, handler in MENU_HANDLERS.items()}
+        # Object class -> (priority, menu builder)
+        builders = (
+            ('saducRoot', self._build_saduc_root_menu),
+            ('savedQueriesRoot', self._build_saved_queries_menu),
+            ('domainDns', self._build_domain_menu),
+            ('organizationalUnit', self._build_ou_menu),
+            ('container', self._build_container_menu),
+            ('builtinDomain', self._build_container_menu)
+        )
+        self._builders = {oc: (priority, builder) for priority, (oc, builder) in enumerate(builders)}
+        # One menu is shared by every right click and refilled each time
+        self._menu = QMenu(self.main_window)
+        self._submenus = []
+        self._menu_busy = False
+        self._properties_action = QAction(self.main_window)
+        self._properties_action.setFont(self._bold_font)
+        self._properties_action.triggered.connect(self._cb['container_properties'])
+        self.reload_labels()
+
+    def reload_labels(self):
+        """Resolves the menu labels, e.g. again after the UI language changes."""
+        self._L = {key: self.i18n.get_string(key) for key in MENU_LABEL_KEYS}
+        self._properties_action.setText(self._L["context_menu.properties"])
 
     def on_tree_context_menu(self, position):
         self.main_window.logger.info("Tree context menu requested.")
@@ -14,162 +124,159 @@ class TreeMenuManager:
             return
 
         tree_item = index.internalPointer()
-        dn = tree_item.dn()
-        obj_classes = tree_item.object_class() if isinstance(tree_item.object_class(), list) else [tree_item.object_class()]
-        menu = QMenu()
-
-        if 'saducRoot' in obj_classes:
-            self._build_saduc_root_menu(menu, dn)
-        elif 'savedQueriesRoot' in obj_classes:
-            self._build_saved_queries_menu(menu, dn)
-        elif 'domainDns' in obj_classes:
-            self._build_domain_menu(menu, dn)
-        elif 'organizationalUnit' in obj_classes:
-            self._build_ou_menu(menu, dn)
-        elif 'container' in obj_classes or 'builtinDomain' in obj_classes:
-            self._build_container_menu(menu, dn)
+        dn = index.data(DN_ROLE)
+        obj_classes = tree_item.object_classes
+        if self._menu_busy:
+            return
+
+        # Reuse the one menu, dropping the previous right click's entries
+        menu = self._menu
+        menu.clear()
+        for submenu in self._submenus:
+            submenu.deleteLater()
+        self._submenus = []
+
+        # An item matching several builders gets the earliest one listed
+        best = None
+        for oc in obj_classes:
+            entry = self._builders.get(oc)
+            if entry is not None and (best is None or entry[0] < best[0]):
+                best = entry
+        if best is not None:
+            best[1](menu, dn)
 
         if not menu.isEmpty():
-            menu.exec_(self.main_window.treePane.viewport().mapToGlobal(position))
+            self._menu_busy = True
+            try:
+                menu.exec_(self.main_window.treePane.viewport().mapToGlobal(position))
+            finally:
+                self._menu_busy = False
+
+    def _add_properties_action(self, menu):
+        menu.addAction(self._properties_action)
+
+    def _add_lazy_submenu(self, parent, label, builder, *args):
+        """
+        Adds a submenu that is only filled in by builder(submenu, *args) when
+        it is first opened.
+        """
+        submenu = parent.addMenu(label)
+        # clear() only removes the submenu's entry, so track it for deletion
+        self._submenus.append(submenu)
+        submenu.aboutToShow.connect(lambda: self._populate_once(submenu, builder, *args))
+        return submenu
+
+    def _populate_once(self, submenu, builder, *args):
+        if getattr(submenu, '_populated', False):
+            return
+        submenu._populated = True
+        builder(submenu, *args)
+
+    def _populate_new_query_menu(self, new_menu):
+        new_menu.addAction(self._L["context_menu.new_query"], self._cb['new_query'])
 
     def _populate_view_menu(self, view_menu):
-        view_menu.addAction(self.i18n.get_string("context_menu.view_add_remove_columns"), partial(actions.on_view_add_remove_columns_action_triggered, self.main_window))
+        view_menu.addAction(self._L["context_menu.view_add_remove_columns"], self._cb['view_add_remove_columns'])
         view_menu.addSeparator()
-        view_menu.addAction(self.i18n.get_string("context_menu.view_large_icons"), partial(actions.on_view_large_icons_action_triggered, self.main_window))
-        view_menu.addAction(self.i18n.get_string("context_menu.view_small_icons"), partial(actions.on_view_small_icons_action_triggered, self.main_window))
-        view_menu.addAction(self.i18n.get_string("context_menu.view_list"), partial(actions.on_view_list_action_triggered, self.main_window))
-        view_menu.addAction(self.i18n.get_string("context_menu.view_detail"), partial(actions.on_view_detail_action_triggered, self.main_window))
+        view_menu.addAction(self._L["context_menu.view_large_icons"], self._cb['view_large_icons'])
+        view_menu.addAction(self._L["context_menu.view_small_icons"], self._cb['view_small_icons'])
+        view_menu.addAction(self._L["context_menu.view_list"], self._cb['view_list'])
+        view_menu.addAction(self._L["context_menu.view_detail"], self._cb['view_detail'])
         view_menu.addSeparator()
-        view_menu.addAction(self.i18n.get_string("context_menu.view_filter_options"), partial(actions.on_view_filter_options_action_triggered, self.main_window))
-        view_menu.addAction(self.i18n.get_string("context_menu.view_customize"), partial(actions.on_view_customize_action_triggered, self.main_window))
+        view_menu.addAction(self._L["context_menu.view_filter_options"], self._cb['view_filter_options'])
+        view_menu.addAction(self._L["context_menu.view_customize"], self._cb['view_customize'])
 
     def _build_saduc_root_menu(self, menu, dn):
-        menu.addAction(self.i18n.get_string("context_menu.change_domain"), partial(actions.on_change_domain_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("action_pane.menu.change_dc"), partial(actions.on_change_dc_action_triggered, self.main_window))
+        menu.addAction(self._L["context_menu.change_domain"], self._cb['change_domain'])
+        menu.addAction(self._L["action_pane.menu.change_dc"], self._cb['change_dc'])
         menu.addSeparator()
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        self._populate_all_tasks_menu(all_tasks_menu, dn, 'saducRoot')
+        self._add_lazy_submenu(menu, self._L["context_menu.all_tasks"], self._populate_all_tasks_menu, dn, 'saducRoot')
         menu.addSeparator()
-        view_menu = menu.addMenu(self.i18n.get_string("context_menu.view"))
-        self._populate_view_menu(view_menu)
+        self._add_lazy_submenu(menu, self._L["context_menu.view"], self._populate_view_menu)
         menu.addSeparator()
-        menu.addAction(self.i18n.get_string("context_menu.refresh"), partial(actions.on_refresh_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.export_list"), partial(actions.on_export_list_action_triggered, self.main_window))
+        menu.addAction(self._L["context_menu.refresh"], self._cb['refresh'])
+        menu.addAction(self._L["context_menu.export_list"], self._cb['export_list'])
 
     def _build_saved_queries_menu(self, menu, dn):
-        menu.addAction(self.i18n.get_string("context_menu.import_query"), partial(actions.on_import_query_definition_action_triggered, self.main_window))
+        menu.addAction(self._L["context_menu.import_query"], self._cb['import_query_definition'])
         menu.addSeparator()
-        new_menu = menu.addMenu(self.i18n.get_string("context_menu.new"))
-        new_menu.addAction(self.i18n.get_string("context_menu.new_query"), partial(actions.on_new_query_action_triggered, self.main_window))
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        self._populate_all_tasks_menu(all_tasks_menu, dn, 'savedQueriesRoot')
+        self._add_lazy_submenu(menu, self._L["context_menu.new"], self._populate_new_query_menu)
+        self._add_lazy_submenu(menu, self._L["context_menu.all_tasks"], self._populate_all_tasks_menu, dn, 'savedQueriesRoot')
         menu.addSeparator()
-        menu.addAction(self.i18n.get_string("context_menu.refresh"), partial(actions.on_refresh_action_triggered, self.main_window))
+        menu.addAction(self._L["context_menu.refresh"], self._cb['refresh'])
         menu.addSeparator()
-        properties_action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
-        font = properties_action.font()
-        font.setBold(True)
-        properties_action.setFont(font)
-        properties_action.triggered.connect(partial(actions.on_container_properties_action_triggered, self.main_window))
-        menu.addAction(properties_action)
+        self._add_properties_action(menu)
 
     def _build_domain_menu(self, menu, dn):
         self.main_window.currentContainerDN = dn
-        menu.addAction(self.i18n.get_string("context_menu.delegate_control"), partial(actions.on_delegate_control_action_triggered, self.main_window))
-        find_action = QAction(self.i18n.get_string("action_pane.menu.find_user"), self.main_window)
-        find_action.triggered.connect(lambda: actions.on_find_user_action_triggered(self.main_window, dn))
-        menu.addAction(find_action)
-        menu.addAction(self.i18n.get_string("context_menu.change_domain"), partial(actions.on_change_domain_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("action_pane.menu.change_dc"), partial(actions.on_change_dc_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.raise_domain_level"), partial(actions.on_raise_domain_functional_level_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.operations_masters"), partial(actions.on_operations_masters_action_triggered, self.main_window))
+        menu.addAction(self._L["context_menu.delegate_control"], self._cb['delegate_control'])
+        menu.addAction(self._L["action_pane.menu.find_user"], self._cb['find_user'])
+        menu.addAction(self._L["context_menu.change_domain"], self._cb['change_domain'])
+        menu.addAction(self._L["action_pane.menu.change_dc"], self._cb['change_dc'])
+        menu.addAction(self._L["context_menu.raise_domain_level"], self._cb['raise_domain_functional_level'])
+        menu.addAction(self._L["context_menu.operations_masters"], self._cb['operations_masters'])
         menu.addSeparator()
-        new_menu = menu.addMenu(self.i18n.get_string("context_menu.new"))
-        self._populate_new_menu(new_menu)
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        self._populate_all_tasks_menu(all_tasks_menu, dn, 'domainDns')
+        self._add_lazy_submenu(menu, self._L["context_menu.new"], self._populate_new_menu)
+        self._add_lazy_submenu(menu, self._L["context_menu.all_tasks"], self._populate_all_tasks_menu, dn, 'domainDns')
         menu.addSeparator()
-        menu.addAction(self.i18n.get_string("context_menu.refresh"), partial(actions.on_refresh_action_triggered, self.main_window))
+        menu.addAction(self._L["context_menu.refresh"], self._cb['refresh'])
         menu.addSeparator()
-        properties_action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
-        font = properties_action.font()
-        font.setBold(True)
-        properties_action.setFont(font)
-        properties_action.triggered.connect(partial(actions.on_container_properties_action_triggered, self.main_window))
-        menu.addAction(properties_action)
+        self._add_properties_action(menu)
 
     def _build_container_menu(self, menu, dn):
         self.main_window.currentContainerDN = dn
-        menu.addAction(self.i18n.get_string("context_menu.delegate_control"), partial(actions.on_delegate_control_action_triggered, self.main_window))
-        find_action = QAction(self.i18n.get_string("action_pane.menu.find_user"), self.main_window)
-        find_action.triggered.connect(lambda: actions.on_find_user_action_triggered(self.main_window, dn))
-        menu.addAction(find_action)
+        menu.addAction(self._L["context_menu.delegate_control"], self._cb['delegate_control'])
+        menu.addAction(self._L["action_pane.menu.find_user"], self._cb['find_user'])
         menu.addSeparator()
-        new_menu = menu.addMenu(self.i18n.get_string("context_menu.new"))
-        self._populate_new_menu(new_menu, is_container=True)
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        self._populate_all_tasks_menu(all_tasks_menu, dn, 'container')
+        self._add_lazy_submenu(menu, self._L["context_menu.new"], self._populate_new_menu, True)
+        self._add_lazy_submenu(menu, self._L["context_menu.all_tasks"], self._populate_all_tasks_menu, dn, 'container')
         menu.addSeparator()
-        properties_action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
-        font = properties_action.font()
-        font.setBold(True)
-        properties_action.setFont(font)
-        properties_action.triggered.connect(partial(actions.on_container_properties_action_triggered, self.main_window))
-        menu.addAction(properties_action)
+        self._add_properties_action(menu)
 
     def _build_ou_menu(self, menu, dn):
         self.main_window.currentContainerDN = dn
-        menu.addAction(self.i18n.get_string("context_menu.delegate_control"), partial(actions.on_delegate_control_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.move"), partial(actions.on_move_action_triggered, self.main_window))
-        find_action = QAction(self.i18n.get_string("action_pane.menu.find_user"), self.main_window)
-        find_action.triggered.connect(lambda: actions.on_find_user_action_triggered(self.main_window, dn))
-        menu.addAction(find_action)
+        menu.addAction(self._L["context_menu.delegate_control"], self._cb['delegate_control'])
+        menu.addAction(self._L["context_menu.move"], self._cb['move'])
+        menu.addAction(self._L["action_pane.menu.find_user"], self._cb['find_user'])
         menu.addSeparator()
-        new_menu = menu.addMenu(self.i18n.get_string("context_menu.new"))
-        self._populate_new_menu(new_menu)
-        all_tasks_menu = menu.addMenu(self.i18n.get_string("context_menu.all_tasks"))
-        self._populate_all_tasks_menu(all_tasks_menu, dn, 'organizationalUnit')
+        self._add_lazy_submenu(menu, self._L["context_menu.new"], self._populate_new_menu)
+        self._add_lazy_submenu(menu, self._L["context_menu.all_tasks"], self._populate_all_tasks_menu, dn, 'organizationalUnit')
         menu.addSeparator()
-        menu.addAction(self.i18n.get_string("context_menu.cut"), partial(actions.on_stub_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.delete"), partial(actions.on_delete_container_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.rename"), partial(actions.on_rename_action_triggered, self.main_window))
-        menu.addAction(self.i18n.get_string("context_menu.refresh"), partial(actions.on_refresh_action_triggered, self.main_window))
+        menu.addAction(self._L["context_menu.cut"], self._cb['stub'])
+        menu.addAction(self._L["context_menu.delete"], self._cb['delete_container'])
+        menu.addAction(self._L["context_menu.rename"], self._cb['rename'])
+        menu.addAction(self._L["context_menu.refresh"], self._cb['refresh'])
         menu.addSeparator()
-        properties_action = QAction(self.i18n.get_string("context_menu.properties"), self.main_window)
-        font = properties_action.font()
-        font.setBold(True)
-        properties_action.setFont(font)
-        properties_action.triggered.connect(partial(actions.on_container_properties_action_triggered, self.main_window))
-        menu.addAction(properties_action)
+        self._add_properties_action(menu)
 
     def _populate_new_menu(self, new_menu, is_container=False):
-        new_menu.addAction(self.i18n.get_string("action_pane.menu.new_computer"), partial(actions.on_new_computer_action_triggered, self.main_window))
-        new_menu.addAction(self.i18n.get_string("context_menu.new_contact"), partial(actions.on_new_contact_action_triggered, self.main_window))
-        new_menu.addAction(self.i18n.get_string("action_pane.menu.new_group"), partial(actions.on_new_group_action_triggered, self.main_window))
-        new_menu.addAction(self.i18n.get_string("context_menu.new_inetorgperson"), partial(actions.on_new_inetorgperson_action_triggered, self.main_window))
+        new_menu.addAction(self._L["action_pane.menu.new_computer"], self._cb['new_computer'])
+        new_menu.addAction(self._L["context_menu.new_contact"], self._cb['new_contact'])
+        new_menu.addAction(self._L["action_pane.menu.new_group"], self._cb['new_group'])
+        new_menu.addAction(self._L["context_menu.new_inetorgperson"], self._cb['new_inetorgperson'])
         if is_container:
-            new_menu.addAction(self.i18n.get_string("context_menu.new_msds_keycredential"), partial(actions.on_new_msds_keycredential_action_triggered, self.main_window))
-            new_menu.addAction(self.i18n.get_string("context_menu.new_msds_resourcepropertylist"), partial(actions.on_new_msds_resourcepropertylist_action_triggered, self.main_window))
-            new_menu.addAction(self.i18n.get_string("context_menu.new_msds_shadowprincipalcontainer"), partial(actions.on_new_msds_shadowprincipalcontainer_action_triggered, self.main_window))
-        new_menu.addAction(self.i18n.get_string("context_menu.new_msimaging_psps"), partial(actions.on_new_msimaging_psps_action_triggered, self.main_window))
-        new_menu.addAction(self.i18n.get_string("context_menu.new_msmq_queue_alias"), partial(actions.on_new_msmq_queue_alias_action_triggered, self.main_window))
+            new_menu.addAction(self._L["context_menu.new_msds_keycredential"], self._cb['new_msds_keycredential'])
+            new_menu.addAction(self._L["context_menu.new_msds_resourcepropertylist"], self._cb['new_msds_resourcepropertylist'])
+            new_menu.addAction(self._L["context_menu.new_msds_shadowprincipalcontainer"], self._cb['new_msds_shadowprincipalcontainer'])
+        new_menu.addAction(self._L["context_menu.new_msimaging_psps"], self._cb['new_msimaging_psps'])
+        new_menu.addAction(self._L["context_menu.new_msmq_queue_alias"], self._cb['new_msmq_queue_alias'])
         if not is_container:
-            new_menu.addAction(self.i18n.get_string("context_menu.new_ou"), partial(actions.on_new_ou_action_triggered, self.main_window))
-        new_menu.addAction(self.i18n.get_string("context_menu.new_printer"), partial(actions.on_new_printer_action_triggered, self.main_window))
-        new_menu.addAction(self.i18n.get_string("action_pane.menu.new_user"), partial(actions.on_new_user_action_triggered, self.main_window))
-        new_menu.addAction(self.i18n.get_string("context_menu.new_shared_folder"), partial(actions.on_new_shared_folder_action_triggered, self.main_window))
+            new_menu.addAction(self._L["context_menu.new_ou"], self._cb['new_ou'])
+        new_menu.addAction(self._L["context_menu.new_printer"], self._cb['new_printer'])
+        new_menu.addAction(self._L["action_pane.menu.new_user"], self._cb['new_user'])
+        new_menu.addAction(self._L["context_menu.new_shared_folder"], self._cb['new_shared_folder'])
 
     def _populate_all_tasks_menu(self, all_tasks_menu, dn, object_type):
         # This is a generic placeholder. You can customize this based on object_type.
         if object_type in ['domainDns', 'organizationalUnit', 'container']:
-            all_tasks_menu.addAction(self.i18n.get_string("context_menu.delegate_control"), partial(actions.on_delegate_control_action_triggered, self.main_window))
+            all_tasks_menu.addAction(self._L["context_menu.delegate_control"], self._cb['delegate_control'])
         if object_type == 'domainDns':
-            all_tasks_menu.addAction(self.i18n.get_string("context_menu.raise_domain_level"), partial(actions.on_raise_domain_functional_level_action_triggered, self.main_window))
-            all_tasks_menu.addAction(self.i18n.get_string("context_menu.operations_masters"), partial(actions.on_operations_masters_action_triggered, self.main_window))
+            all_tasks_menu.addAction(self._L["context_menu.raise_domain_level"], self._cb['raise_domain_functional_level'])
+            all_tasks_menu.addAction(self._L["context_menu.operations_masters"], self._cb['operations_masters'])
         if object_type == 'saducRoot':
-            all_tasks_menu.addAction(self.i18n.get_string("context_menu.change_domain"), partial(actions.on_change_domain_action_triggered, self.main_window))
-            all_tasks_menu.addAction(self.i18n.get_string("action_pane.menu.change_dc"), partial(actions.on_change_dc_action_triggered, self.main_window))
+            all_tasks_menu.addAction(self._L["context_menu.change_domain"], self._cb['change_domain'])
+            all_tasks_menu.addAction(self._L["action_pane.menu.change_dc"], self._cb['change_dc'])
         if object_type == 'savedQueriesRoot':
-            all_tasks_menu.addAction(self.i18n.get_string("context_menu.import_query"), partial(actions.on_import_query_definition_action_triggered, self.main_window))
-            new_query_action = all_tasks_menu.addAction(self.i18n.get_string("context_menu.new_query"))
-            new_query_action.triggered.connect(partial(actions.on_new_query_action_triggered, self.main_window))
+            all_tasks_menu.addAction(self._L["context_menu.import_query"], self._cb['import_query_definition'])
+            new_query_action = all_tasks_menu.addAction(self._L["context_menu.new_query"])
+            new_query_action.triggered.connect(self._cb['new_query'])